@@ -0,0 +1,258 @@
+import contextlib
+import csv
+import io
+import json
+import math
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from BenchmarkFakes import FakeAutoMlClient, FakePredictionClient, FakeReviewSite, FakeStorageClient
+from ClientRegistry import ClientRegistry
+from ConfigVariables import ConfigVariables
+from ConsoleColor import ConsoleColor
+from ReviewPageGenerator import ReviewPageGenerator
+
+
+class LatencyRecorder:
+
+    def __init__(self):
+        self.latencies = []
+
+    def wrap(self, function):
+        def timed_function(*args, **kwargs):
+            start = time.perf_counter()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.latencies.append(time.perf_counter() - start)
+
+        return timed_function
+
+
+class Benchmark:
+    scenarios = ("scrape", "upload", "predict", "plot")
+
+    def __init__(self, reviews: int = 10000, pages: int = 50, concurrency: int = 8, latency_ms: float = 20,
+                 error_rate: float = 0.01, rounds: int = 3):
+        self.parameters = {
+            "reviews": reviews,
+            "pages": pages,
+            "concurrency": concurrency,
+            "latency_ms": latency_ms,
+            "error_rate": error_rate
+        }
+        self.rounds = rounds
+        self.resultsFile = ConfigVariables.benchmarkResultsFile
+
+    def run(self, scenarios: list = None) -> list:
+        results = []
+
+        for scenario in scenarios or ():
+            if scenario not in self.scenarios:
+                raise ValueError(f"Unknown benchmark scenario: {scenario}")
+
+        print(f"{ConsoleColor.GREEN}Benchmark with {self.parameters}, {self.rounds} rounds{ConsoleColor.END}")
+
+        for scenario in scenarios or self.scenarios:
+            result = self.__run_scenario(scenario)
+            self.__print_result(result, self.__previous_result(result))
+            self.__save_result(result)
+            results.append(result)
+
+        return results
+
+    def __run_scenario(self, scenario: str) -> dict:
+        run_round = getattr(self, f"_Benchmark__{scenario}")
+        throughputs = []
+        latencies = []
+
+        for _ in range(self.rounds):
+            items, round_latencies, seconds = self.__run_round(run_round)
+            throughputs.append(items / seconds)
+            latencies.extend(round_latencies)
+
+        # Tracing slows everything down, so memory is measured in a round of its own
+        tracemalloc.start()
+
+        try:
+            self.__run_round(run_round)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "scenario": scenario,
+            "parameters": self.parameters,
+            "items_per_second": statistics.median(throughputs),
+            "p50_ms": self.__percentile(latencies, 50) * 1000,
+            "p99_ms": self.__percentile(latencies, 99) * 1000,
+            "peak_memory_mib": peak_memory / 2 ** 20
+        }
+
+    def __run_round(self, run_round) -> tuple:
+        recorder = LatencyRecorder()
+
+        # Every round starts from empty folders, caches and fakes, so the rounds are comparable
+        with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            items = run_round(directory, recorder)
+            seconds = time.perf_counter() - start
+
+        return items, recorder.latencies or [seconds], seconds
+
+    def __scrape(self, directory: str, recorder: LatencyRecorder) -> int:
+        pages = self.parameters["pages"]
+        reviews_per_page = math.ceil(self.parameters["reviews"] / pages)
+
+        with FakeReviewSite(pages, reviews_per_page, self.parameters["latency_ms"] / 1000) as review_site, \
+                self.__configured(
+                    localPredictionCsvFilesLocation=directory,
+                    scraperWorkers=self.parameters["concurrency"],
+                    scraperRequestsPerHost=self.parameters["concurrency"]
+                ):
+            from WebScraper import WebScraper
+
+            web_scraper = WebScraper()
+            web_scraper.page_fetcher.fetch = recorder.wrap(web_scraper.page_fetcher.fetch)
+            web_scraper.web_scrape(review_site.url, "benchmark")
+            web_scraper.page_fetcher.close()
+
+        return pages
+
+    def __upload(self, directory: str, recorder: LatencyRecorder) -> int:
+        self.__write_reviews(os.path.join(directory, f"benchmark{ConfigVariables.blobExtension}"))
+        storage_client = FakeStorageClient(self.parameters["latency_ms"] / 1000)
+
+        with self.__configured(
+                localDatasetCsvFilesLocation=directory,
+                uploadIndexFile=os.path.join(directory, "upload-index.json"),
+                storageUploadWorkers=self.parameters["concurrency"]
+        ):
+            from StorageAPI import StorageAPI
+
+            storage_api = StorageAPI(storage_client)
+            storage_api.bucket.simulate_request = recorder.wrap(storage_api.bucket.simulate_request)
+            storage_api.create_blob("benchmark", "benchmark")
+
+        return self.parameters["reviews"]
+
+    def __predict(self, directory: str, recorder: LatencyRecorder) -> int:
+        self.__write_reviews(os.path.join(directory, f"benchmark{ConfigVariables.blobExtension}"))
+        prediction_client = FakePredictionClient(self.parameters["latency_ms"] / 1000, self.parameters["error_rate"])
+        prediction_client.predict = recorder.wrap(prediction_client.predict)
+        clients = dict(ClientRegistry.clients)
+
+        with self.__configured(
+                localPredictionCsvFilesLocation=directory,
+                localResultCsvFilesLocation=directory,
+                predictionCacheFile=os.path.join(directory, "prediction-cache.sqlite3"),
+                operationsFile=os.path.join(directory, "operations.json"),
+                predictionBackend="automl",
+                predictionResultFormat="csv",
+                # The quota of the real service is not what is measured here
+                predictionRequestsPerMinute=10 ** 9,
+                predictionWorkers=self.parameters["concurrency"],
+                predictionMaxInFlight=max(ConfigVariables.predictionMaxInFlight, self.parameters["concurrency"] * 4)
+        ):
+            ClientRegistry.clients.update(automl=FakeAutoMlClient(), prediction=prediction_client)
+
+            try:
+                from NaturalLanguageAPI import NaturalLanguageAPI
+
+                NaturalLanguageAPI().apply_model_prediction("benchmark", "benchmark")
+            finally:
+                ClientRegistry.clients.clear()
+                ClientRegistry.clients.update(clients)
+
+        return self.parameters["reviews"]
+
+    def __plot(self, directory: str, recorder: LatencyRecorder) -> int:
+        result_file_path = os.path.join(directory, f"benchmark{ConfigVariables.blobExtension}")
+        generator = random.Random(0)
+
+        with open(result_file_path, "w", encoding="UTF-8") as result_file:
+            for review in self.__reviews():
+                result_file.write(f"{review},{generator.choice(ConfigVariables.predictionCategories)}\n")
+
+        from GraphCreator import GraphCreator
+
+        recorder.wrap(GraphCreator().plot_review_categories)(result_file_path, os.path.join(directory, "benchmark.png"))
+
+        return self.parameters["reviews"]
+
+    def __reviews(self):
+        review_page_generator = ReviewPageGenerator(1)
+        generator = random.Random(0)
+
+        for _ in range(self.parameters["reviews"]):
+            yield " ".join(generator.choice(review_page_generator.words) for _ in range(generator.randint(10, 120)))
+
+    def __write_reviews(self, file_path: str):
+        with open(file_path, "w", encoding="UTF-8", newline="") as reviews_file:
+            writer = csv.writer(reviews_file, lineterminator="\n")
+
+            for review in self.__reviews():
+                writer.writerow((review, ConfigVariables.predictionCategories[len(review) % 3]))
+
+    @contextlib.contextmanager
+    def __configured(self, **values):
+        previous_values = {name: getattr(ConfigVariables, name) for name in values}
+
+        for name, value in values.items():
+            setattr(ConfigVariables, name, value)
+
+        try:
+            yield
+        finally:
+            for name, value in previous_values.items():
+                setattr(ConfigVariables, name, value)
+
+    def __percentile(self, values: list, percentile: int) -> float:
+        ordered_values = sorted(values)
+        index = min(len(ordered_values) - 1, math.ceil(percentile / 100 * len(ordered_values)) - 1)
+
+        return ordered_values[max(0, index)]
+
+    def __previous_result(self, result: dict):
+        if not os.path.exists(self.resultsFile):
+            return None
+
+        previous_result = None
+
+        with open(self.resultsFile, "r", encoding="UTF-8") as results_file:
+            for line in results_file:
+                saved_result = json.loads(line)
+
+                if saved_result["scenario"] == result["scenario"] and saved_result["parameters"] == result["parameters"]:
+                    previous_result = saved_result
+
+        return previous_result
+
+    def __save_result(self, result: dict):
+        with open(self.resultsFile, "a", encoding="UTF-8") as results_file:
+            results_file.write(json.dumps(result) + "\n")
+
+    def __print_result(self, result: dict, previous_result: dict):
+        change = ""
+
+        if previous_result:
+            ratio = result["items_per_second"] / previous_result["items_per_second"] - 1
+            color = ConsoleColor.GREEN if ratio >= 0 else ConsoleColor.RED
+            change = f" {color}{ratio:+.1%} vs {previous_result['time']}{ConsoleColor.END}"
+
+        print(
+            f"{result['scenario']}: {result['items_per_second']:.1f} items/sec, "
+            f"p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms, "
+            f"peak memory {result['peak_memory_mib']:.1f} MiB{change}"
+        )
+
+
+if __name__ == '__main__':
+    Benchmark().run()
@@ -0,0 +1,217 @@
+import base64
+import hashlib
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+import google_crc32c
+from google.api_core import exceptions
+
+from ConfigVariables import ConfigVariables
+from ReviewPageGenerator import ReviewPageGenerator
+
+
+class FakeBlob:
+
+    def __init__(self, bucket, name: str, chunk_size: int = None):
+        self.bucket = bucket
+        self.name = name
+        self.chunk_size = chunk_size
+        self.content_type = None
+        self.data = b""
+        self.size = None
+        self.crc32c = None
+        self.updated = None
+
+    def upload_from_file(self, file_obj, size: int = None, rewind: bool = False, content_type: str = None,
+                         retry=None):
+        if rewind:
+            file_obj.seek(0)
+
+        # The real client needs it for resumable uploads, the fake asks it of every upload so small files catch it too
+        if file_obj.tell() != 0:
+            raise ValueError("Stream must be at beginning.")
+
+        self.__store(file_obj.read() if size is None else file_obj.read(size), content_type)
+
+    def upload_from_filename(self, filename: str, content_type: str = None, retry=None):
+        with open(filename, "rb") as file_obj:
+            self.upload_from_file(file_obj, content_type=content_type)
+
+    def compose(self, sources: list, retry=None):
+        self.__store(b"".join(self.bucket.get_blob(source.name).data for source in sources), self.content_type)
+
+    def delete(self):
+        self.bucket.delete_blob(self.name)
+
+    def __store(self, data: bytes, content_type: str):
+        self.bucket.simulate_request()
+        self.data = data
+        self.size = len(data)
+        self.crc32c = base64.b64encode(google_crc32c.Checksum(data).digest()).decode("UTF-8")
+        self.content_type = content_type or self.content_type
+        self.updated = datetime.now(timezone.utc)
+        self.bucket.save_blob(self)
+
+
+class FakeBucket:
+
+    def __init__(self, name: str, latency_seconds: float = 0.0):
+        self.name = name
+        self.latency_seconds = latency_seconds
+        self.blobs = {}
+        self.lock = threading.Lock()
+
+    def blob(self, blob_name: str, chunk_size: int = None) -> FakeBlob:
+        return FakeBlob(self, blob_name, chunk_size)
+
+    def get_blob(self, blob_name: str):
+        self.simulate_request()
+
+        with self.lock:
+            return self.blobs.get(blob_name)
+
+    def delete_blob(self, blob_name: str):
+        with self.lock:
+            if self.blobs.pop(blob_name, None) is None:
+                raise exceptions.NotFound(blob_name)
+
+    def delete_blobs(self, blobs: list, on_error=None):
+        for blob in blobs:
+            try:
+                self.delete_blob(blob.name)
+            except exceptions.NotFound:
+                if on_error is None:
+                    raise
+
+                on_error(blob)
+
+    def save_blob(self, blob: FakeBlob):
+        with self.lock:
+            self.blobs[blob.name] = blob
+
+    def simulate_request(self):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+
+class FakeStorageClient:
+
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.buckets = {}
+
+    def bucket(self, bucket_name: str) -> FakeBucket:
+        return self.buckets.setdefault(bucket_name, FakeBucket(bucket_name, self.latency_seconds))
+
+    def list_blobs(self, bucket_name: str, prefix: str = None, page_size: int = None, fields: str = None) -> list:
+        bucket = self.bucket(bucket_name)
+        bucket.simulate_request()
+
+        with bucket.lock:
+            return [blob for name, blob in sorted(bucket.blobs.items()) if name.startswith(prefix or "")]
+
+
+class FakePredictionClient:
+
+    def __init__(self, latency_seconds: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency_seconds = latency_seconds
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def predict(self, name: str, payload):
+        with self.lock:
+            self.requests += 1
+            failed = self.random.random() < self.error_rate
+            self.errors += failed
+
+        time.sleep(self.latency_seconds)
+
+        if failed:
+            raise exceptions.ServiceUnavailable("Fake prediction service is unavailable")
+
+        # The same snippet always gets the same scores
+        digest = hashlib.sha256(payload.text_snippet.content.encode("UTF-8")).digest()
+        weights = [byte + 1 for byte in digest[:len(ConfigVariables.predictionCategories)]]
+
+        return SimpleNamespace(payload=[
+            SimpleNamespace(display_name=category, classification=SimpleNamespace(score=weight / sum(weights)))
+            for category, weight in zip(ConfigVariables.predictionCategories, weights)
+        ])
+
+
+class FakeAutoMlClient:
+
+    def __init__(self):
+        self._transport = SimpleNamespace(operations_client=None)
+
+
+class FakeReviewSite:
+
+    def __init__(self, page_amount: int, reviews_per_page: int = 100, latency_seconds: float = 0.0,
+                 failures_per_page: int = 0):
+        review_page_generator = ReviewPageGenerator(page_amount, reviews_per_page)
+        # Pages are generated up front, so the server takes no time from the client being measured
+        pages = [review_page_generator.generate_page(page).encode("UTF-8") for page in range(page_amount)]
+        review_site = self
+        self.lock = threading.Lock()
+        self.requests = [0] * page_amount
+        self.concurrent_requests = 0
+        self.max_concurrent_requests = 0
+
+        class ReviewPageHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                page = int(parse_qs(url.query).get("page", ["0"])[0])
+
+                if not url.path.endswith("/user-reviews") or page >= len(pages):
+                    self.send_error(404)
+                    return
+
+                with review_site.lock:
+                    review_site.requests[page] += 1
+                    unavailable = review_site.requests[page] <= failures_per_page
+                    review_site.concurrent_requests += 1
+                    review_site.max_concurrent_requests = max(
+                        review_site.max_concurrent_requests, review_site.concurrent_requests
+                    )
+
+                try:
+                    time.sleep(latency_seconds)
+                finally:
+                    with review_site.lock:
+                        review_site.concurrent_requests -= 1
+
+                # The first requests of every page fail like an overloaded server
+                if unavailable:
+                    self.send_error(503)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(pages[page])))
+                self.end_headers()
+                self.wfile.write(pages[page])
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ReviewPageHandler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/movie/fake-film"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,253 @@
+import argparse
+import contextlib
+import os
+
+from ConfigVariables import ConfigVariables
+from ConsoleColor import ConsoleColor
+from JobRunner import JobRunner
+from Metrics import metrics
+from Profiler import Profiler
+from Services import dataset_preparer, graph_creator, natural_language_api, storage_api, web_scraper
+
+
+class Cli:
+
+    def __init__(self):
+        self.parser = argparse.ArgumentParser(
+            prog="main.py",
+            description="Runs a single action without the interactive menu"
+        )
+        self.parser.add_argument("--metrics", default=ConfigVariables.metricsFile,
+                                 help="write timers and counters to a Prometheus text file")
+        self.parser.add_argument("--trace", default=ConfigVariables.traceFile,
+                                 help="write the timed operations as OpenTelemetry JSON spans")
+        self.parser.add_argument("--profile", choices=Profiler.profilers, default=None)
+        self.parser.add_argument("--profile-output", default=None)
+        commands = self.parser.add_subparsers(dest="command", required=True)
+
+        command = commands.add_parser("scrape", help="get reviews from website")
+        command.add_argument("url")
+        command.add_argument("--output-name", default=None, help="name of the review file, \"<film>-reviews\" when omitted")
+        command.set_defaults(action=lambda args: web_scraper().web_scrape(args.url, args.output_name))
+
+        command = commands.add_parser("batch-scrape", help="get new reviews of many films")
+        command.add_argument("urls_file", help="file with one link per line")
+        command.set_defaults(action=lambda args: web_scraper().batch_scrape(self.__read_lines(args.urls_file)))
+
+        command = commands.add_parser("upload", help="add a blob")
+        command.add_argument("blob_name")
+        command.add_argument("file_name")
+        command.set_defaults(action=lambda args: storage_api().create_blob(args.blob_name, args.file_name))
+
+        command = commands.add_parser("upload-folder", help="add blobs from a folder")
+        command.add_argument("folder")
+        command.add_argument("--prefix", default="")
+        command.set_defaults(action=lambda args: storage_api().create_blobs(args.folder, args.prefix))
+
+        command = commands.add_parser("list-blobs", help="display all blobs")
+        self.__add_listing_arguments(command, "--prefix")
+        command.set_defaults(
+            action=lambda args: storage_api().list_blobs(args.prefix, args.page_size, args.json)
+        )
+
+        command = commands.add_parser("remove-blob", help="remove a blob")
+        command.add_argument("blob_name")
+        command.set_defaults(action=lambda args: storage_api().remove_blob(args.blob_name))
+
+        command = commands.add_parser("prepare-dataset", help="dedupe, validate and shard a dataset file")
+        command.add_argument("file_name")
+        command.add_argument("--shards", type=int, default=None)
+        command.add_argument("--balance", action="store_true", help="downsample every class to the smallest one")
+        command.add_argument("--upload", action="store_true", help="add the shards as blobs and print their prefix")
+        command.set_defaults(action=self.__prepare_dataset)
+
+        command = commands.add_parser("create-dataset", help="create the dataset and import a blob into it")
+        command.add_argument("dataset_name")
+        command.add_argument("blob_name", help="a name ending with / imports every blob under that prefix")
+        command.add_argument("--wait", action="store_true", help="wait until the data is imported")
+        command.set_defaults(
+            action=lambda args: natural_language_api().create_and_fill_dataset(args.dataset_name, args.blob_name, args.wait)
+        )
+
+        command = commands.add_parser("list-datasets", help="display all datasets")
+        self.__add_listing_arguments(command, "--filter")
+        command.set_defaults(
+            action=lambda args: natural_language_api().display_datasets(args.filter, args.page_size, args.json)
+        )
+
+        command = commands.add_parser("remove-dataset", help="remove a dataset")
+        command.add_argument("dataset_id")
+        command.set_defaults(action=lambda args: natural_language_api().remove_dataset(args.dataset_id))
+
+        command = commands.add_parser("train", help="create and train a model")
+        command.add_argument("model_name")
+        command.add_argument("dataset_id")
+        command.add_argument(
+            "--wait", action="store_true", help="wait until the model is trained and return its id, not the operation name"
+        )
+        command.set_defaults(
+            action=lambda args: natural_language_api().create_and_train_model(args.model_name, args.dataset_id, args.wait)
+        )
+
+        command = commands.add_parser("train-local", help="create and train a local model on a dataset file")
+        command.add_argument("model_name")
+        command.add_argument("file_name")
+        command.set_defaults(
+            action=lambda args: natural_language_api().create_and_train_local_model(args.model_name, args.file_name)
+        )
+
+        command = commands.add_parser("evaluate", help="evaluate a model")
+        command.add_argument("model_id")
+        command.set_defaults(action=lambda args: natural_language_api().evaluate_model(args.model_id))
+
+        command = commands.add_parser("deploy", help="deploy a model")
+        command.add_argument("model_id")
+        command.add_argument("--wait", action="store_true", help="wait until the model is deployed")
+        command.set_defaults(action=lambda args: natural_language_api().deploy_model(args.model_id, args.wait))
+
+        command = commands.add_parser("predict", help="apply model prediction")
+        command.add_argument("model_id")
+        command.add_argument("file_name")
+        command.add_argument("--backend", choices=("automl", "local"), default=None)
+        command.add_argument("--format", choices=("csv", "parquet"), default=None, help="format of the result")
+        command.add_argument("--plot", action="store_true", help="plot the review categories afterwards")
+        command.set_defaults(action=self.__predict)
+
+        command = commands.add_parser("serve", help="classify texts sent over HTTP until stopped with Ctrl+C")
+        command.add_argument("model_id")
+        command.add_argument("--backend", choices=("automl", "local"), default=None)
+        command.add_argument("--host", default=None)
+        command.add_argument("--port", type=int, default=None)
+        command.set_defaults(action=self.__serve)
+
+        command = commands.add_parser("list-models", help="display all models")
+        self.__add_listing_arguments(command, "--filter")
+        command.set_defaults(
+            action=lambda args: natural_language_api().display_models(args.filter, args.page_size, args.json)
+        )
+
+        command = commands.add_parser("remove-model", help="remove a model")
+        command.add_argument("model_id")
+        command.set_defaults(action=lambda args: natural_language_api().remove_model(args.model_id))
+
+        command = commands.add_parser("operations", help="display all current operations")
+        command.set_defaults(action=lambda args: natural_language_api().display_current_operations())
+
+        command = commands.add_parser("wait-operations", help="wait until the operations started here finish")
+        command.add_argument("operation_names", nargs="*", help="all tracked operations when omitted")
+        command.set_defaults(
+            action=lambda args: natural_language_api().wait_for_operations(args.operation_names or None)
+        )
+
+        command = commands.add_parser("plot", help="plot the review categories of a prediction result")
+        command.add_argument("csv_file")
+        command.add_argument("--output", default=None, help="render to a PNG/SVG file instead of a window")
+        command.set_defaults(action=lambda args: graph_creator().plot_review_categories(args.csv_file, args.output))
+
+        command = commands.add_parser("plot-all", help="render the review categories of many prediction results")
+        command.add_argument("csv_files", nargs="*", help="all prediction results when omitted")
+        command.add_argument("--group-by", choices=("film", "day"), default="film")
+        command.add_argument("--format", choices=("png", "svg"), default="png")
+        command.set_defaults(
+            action=lambda args: graph_creator().plot_all_review_categories(args.csv_files or None, args.group_by, args.format)
+        )
+
+        command = commands.add_parser("plot-store", help="render the review categories of the Parquet result store")
+        command.add_argument("--group-by", choices=("film", "day", "model"), default="film")
+        command.add_argument("--format", choices=("png", "svg"), default="png")
+        command.add_argument("--model-id", default=None)
+        command.add_argument("--date-from", default=None, help="YYYY-MM-DD")
+        command.add_argument("--date-to", default=None, help="YYYY-MM-DD")
+        command.set_defaults(
+            action=lambda args: graph_creator().plot_all_stored_review_categories(
+                args.group_by, args.format, args.model_id, args.date_from, args.date_to
+            )
+        )
+
+        command = commands.add_parser("benchmark", help="measure the hot paths against local fakes")
+        command.add_argument("scenarios", nargs="*", help="scrape, upload, predict or plot, all when omitted")
+        command.add_argument("--reviews", type=int, default=10000)
+        command.add_argument("--pages", type=int, default=50)
+        command.add_argument("--concurrency", type=int, default=8)
+        command.add_argument("--latency-ms", type=float, default=20, help="latency of every fake request")
+        command.add_argument("--error-rate", type=float, default=0.01, help="share of failed prediction requests")
+        command.add_argument("--rounds", type=int, default=3)
+        command.set_defaults(action=self.__benchmark)
+
+        command = commands.add_parser("run-job", help="run the stages of a job file")
+        command.add_argument("job_file")
+        command.set_defaults(action=lambda args: JobRunner(self).run(args.job_file))
+
+    def run(self, argv: list) -> int:
+        args = self.parse(argv)
+
+        try:
+            with contextlib.ExitStack() as stack:
+                if args.profile:
+                    stack.enter_context(Profiler(args.profile, args.profile_output))
+
+                args.action(args)
+        except Exception as ex:
+            print(f"{ConsoleColor.RED}{ex}{ConsoleColor.END}\n")
+            return 1
+        finally:
+            # Metrics of a failed run are the most interesting ones, so they are always written
+            if args.metrics:
+                metrics.export_prometheus(args.metrics)
+
+            if args.trace:
+                metrics.export_spans(args.trace)
+
+        return 0
+
+    def parse(self, argv: list) -> argparse.Namespace:
+        return self.parser.parse_args(argv)
+
+    def execute(self, argv: list):
+        args = self.parse(argv)
+
+        return args.action(args)
+
+    def __predict(self, args: argparse.Namespace) -> str:
+        output_file_path = natural_language_api().apply_model_prediction(
+            args.model_id, args.file_name, args.backend, args.format
+        )
+
+        if args.plot:
+            graph_creator().plot_review_categories(output_file_path)
+
+        return output_file_path
+
+    def __serve(self, args: argparse.Namespace):
+        from PredictionService import PredictionService
+
+        prediction_backend = natural_language_api().create_prediction_backend(args.model_id, args.backend)
+        PredictionService(prediction_backend, args.model_id).run(args.host, args.port)
+
+    def __prepare_dataset(self, args: argparse.Namespace) -> str:
+        output_directory = dataset_preparer().prepare(args.file_name, args.shards, args.balance)
+
+        if not args.upload:
+            return output_directory
+
+        blob_prefix = f"{os.path.basename(output_directory)}/"
+        # Shards of an earlier run may have other names, e.g. with another shard count, and must not be imported
+        storage_api().create_blobs(output_directory, blob_prefix, remove_stale=True)
+
+        return blob_prefix
+
+    def __benchmark(self, args: argparse.Namespace) -> list:
+        from Benchmark import Benchmark
+
+        benchmark = Benchmark(args.reviews, args.pages, args.concurrency, args.latency_ms, args.error_rate, args.rounds)
+
+        return benchmark.run(args.scenarios or None)
+
+    def __add_listing_arguments(self, command: argparse.ArgumentParser, filter_argument: str):
+        command.add_argument(filter_argument, default="", help="applied by the server")
+        command.add_argument("--page-size", type=int, default=None)
+        command.add_argument("--json", action="store_true", help="print the listing as JSON")
+
+    def __read_lines(self, file_path: str) -> list:
+        with open(file_path, "r", encoding="UTF-8") as lines_file:
+            return [line.strip() for line in lines_file if line.strip()]
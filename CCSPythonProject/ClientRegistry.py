@@ -0,0 +1,59 @@
+import threading
+
+
+class ClientRegistry:
+    # Clients are created on first use and shared by every API object of the process
+    clients = {}
+    lock = threading.RLock()
+    automlHost = "automl.googleapis.com:443"
+
+    @classmethod
+    def storage_client(cls):
+        return cls.__get("storage", cls.__create_storage_client)
+
+    @classmethod
+    def automl_client(cls):
+        return cls.__get("automl", cls.__create_automl_client)
+
+    @classmethod
+    def prediction_client(cls):
+        return cls.__get("prediction", cls.__create_prediction_client)
+
+    @classmethod
+    def automl_channel(cls):
+        return cls.__get("automl_channel", cls.__create_automl_channel)
+
+    @classmethod
+    def __get(cls, name: str, create):
+        with cls.lock:
+            if name not in cls.clients:
+                cls.clients[name] = create()
+
+            return cls.clients[name]
+
+    @classmethod
+    def __create_storage_client(cls):
+        from google.cloud import storage
+
+        return storage.Client()
+
+    @classmethod
+    def __create_automl_channel(cls):
+        from google.cloud.automl_v1.services.auto_ml.transports import AutoMlGrpcTransport
+
+        return AutoMlGrpcTransport.create_channel(cls.automlHost)
+
+    @classmethod
+    def __create_automl_client(cls):
+        from google.cloud import automl
+        from google.cloud.automl_v1.services.auto_ml.transports import AutoMlGrpcTransport
+
+        # AutoML and prediction clients talk to the same host, so they share one gRPC channel
+        return automl.AutoMlClient(transport=AutoMlGrpcTransport(channel=cls.automl_channel()))
+
+    @classmethod
+    def __create_prediction_client(cls):
+        from google.cloud import automl
+        from google.cloud.automl_v1.services.prediction_service.transports import PredictionServiceGrpcTransport
+
+        return automl.PredictionServiceClient(transport=PredictionServiceGrpcTransport(channel=cls.automl_channel()))
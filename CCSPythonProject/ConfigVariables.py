@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 
 
@@ -16,3 +17,84 @@ class ConfigVariables:
     localPredictionCsvFilesLocation = os.path.join(pythonProjectRootDirectory, localPredictionCsvFilesFolder)
     localResultCsvFilesFolder = "ReviewsPredictionResult"
     localResultCsvFilesLocation = os.path.join(pythonProjectRootDirectory, localResultCsvFilesFolder)
+    # Online prediction quota of AutoML Natural Language is 600 requests per minute
+    predictionRequestsPerMinute = 600
+    predictionBurstSize = 10
+    predictionWorkers = 8
+    predictionMaxInFlight = 64
+    predictionMaxRetries = 5
+    predictionBackoffSeconds = 0.5
+    predictionCheckpointInterval = 50
+    checkpointExtension = ".checkpoint"
+    predictionCacheFile = os.path.join(pythonProjectRootDirectory, "prediction-cache.sqlite3")
+    predictionCacheMaxEntries = 200000
+    scraperTimeoutSeconds = 15
+    scraperWorkers = 16
+    # Number of simultaneous requests sent to a single website
+    scraperRequestsPerHost = 4
+    scraperMaxRetries = 5
+    scraperBackoffSeconds = 0.5
+    scrapeStateFile = os.path.join(pythonProjectRootDirectory, "scrape-state.json")
+    # Name of the HTML parser backend of the web scraper, None picks the fastest installed one
+    scraperParserBackend = None
+    localFixturePagesFolder = "FixturePages"
+    localFixturePagesLocation = os.path.join(pythonProjectRootDirectory, localFixturePagesFolder)
+    scraperParserWorkers = os.cpu_count()
+    # Worker processes must not be forked from a process whose threads may hold locks
+    processStartMethod = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    # Number of downloaded pages waiting for the parser workers
+    scraperPipelineQueueSize = 32
+    # Chunk size of resumable uploads, it must be a multiple of 256 KiB
+    storageChunkSize = 8 * 1024 * 1024
+    storageCompositeUploadThreshold = 64 * 1024 * 1024
+    # Google Cloud Storage composes at most 32 objects at once
+    storageCompositeMaxParts = 32
+    storageUploadWorkers = 8
+    uploadIndexFile = os.path.join(pythonProjectRootDirectory, "upload-index.json")
+    listingCacheTtlSeconds = 30
+    storageListingPageSize = 1000
+    automlListingPageSize = 100
+    jobMaxWorkers = 4
+    operationsFile = os.path.join(pythonProjectRootDirectory, "operations.json")
+    operationPollInitialSeconds = 5
+    operationPollMaxSeconds = 300
+    operationPollMultiplier = 1.5
+    predictionCategories = ("positive", "negative", "controversial")
+    # Backend of apply_model_prediction, "automl" or "local"
+    predictionBackend = "automl"
+    localPredictionBatchSize = 4096
+    localModelsFolder = "LocalModels"
+    localModelsLocation = os.path.join(pythonProjectRootDirectory, localModelsFolder)
+    graphChunkSize = 100000
+    graphWorkers = os.cpu_count()
+    # Result files larger than this are counted by several processes
+    graphParallelThresholdBytes = 64 * 1024 * 1024
+    localChartsFolder = "Charts"
+    localChartsLocation = os.path.join(pythonProjectRootDirectory, localChartsFolder)
+    predictionResultFormat = "csv"
+    resultStoreBatchSize = 10000
+    localResultStoreFolder = "ReviewsPredictionResultStore"
+    localResultStoreLocation = os.path.join(pythonProjectRootDirectory, localResultStoreFolder)
+    # Longer texts are rejected instead of being paid for in import and training time
+    datasetMaxTextCharacters = 10000
+    datasetShardCount = 8
+    datasetMinShardRows = 1000
+    datasetMinHashPermutations = 128
+    datasetMinHashBands = 16
+    datasetNearDuplicateThreshold = 0.8
+    datasetShingleSize = 3
+    benchmarkResultsFile = os.path.join(pythonProjectRootDirectory, "benchmark-results.jsonl")
+    # Upper bounds in seconds of the latency histograms, the same as the defaults of the Prometheus clients
+    metricsHistogramBuckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    metricsMaxSpans = 100000
+    # Files written after every command line action, None turns the export off
+    metricsFile = None
+    traceFile = None
+    predictionServiceHost = "127.0.0.1"
+    predictionServicePort = 8080
+    predictionServiceMaxBatchSize = 64
+    # Longest time a request waits for others to join its batch
+    predictionServiceMaxWaitMilliseconds = 10
+    predictionServiceMaxConcurrentBatches = 4
+    predictionServiceCacheEntries = 100000
+    predictionServiceMaxBodyBytes = 8 * 1024 * 1024
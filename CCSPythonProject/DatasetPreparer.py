@@ -0,0 +1,204 @@
+import csv
+import hashlib
+import json
+import math
+import os
+import random
+import shutil
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from ConfigVariables import ConfigVariables
+from ConsoleColor import ConsoleColor
+from PredictionCache import PredictionCache
+from ReviewFile import ReviewFile
+
+
+class MinHashIndex:
+    # A 31-bit Mersenne prime, so a * hash + b never overflows 64 bits
+    prime = (1 << 31) - 1
+
+    def __init__(self, permutations: int, bands: int, threshold: float, shingle_size: int, seed: int = 0):
+        generator = np.random.default_rng(seed)
+        self.a = generator.integers(1, self.prime, permutations, dtype=np.uint64)
+        self.b = generator.integers(0, self.prime, permutations, dtype=np.uint64)
+        self.bands = bands
+        self.rows_per_band = permutations // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = []
+
+    def signature(self, text: str) -> np.ndarray:
+        words = text.lower().split()
+        shingles = {
+            " ".join(words[index:index + self.shingle_size])
+            for index in range(max(1, len(words) - self.shingle_size + 1))
+        }
+        hashes = np.fromiter((zlib.crc32(shingle.encode("UTF-8")) for shingle in shingles), np.uint64, len(shingles))
+        hashes %= self.prime
+
+        # One row per permutation, the signature keeps the smallest permuted hash of every row
+        return ((np.outer(self.a, hashes) + self.b[:, None]) % self.prime).min(axis=1)
+
+    def add_if_new(self, text: str) -> bool:
+        signature = self.signature(text)
+        band_keys = [
+            signature[band * self.rows_per_band:(band + 1) * self.rows_per_band].tobytes()
+            for band in range(self.bands)
+        ]
+
+        # Texts sharing a band are only candidates, their estimated similarity decides
+        candidates = {index for band, key in enumerate(band_keys) for index in self.buckets[band].get(key, ())}
+
+        for index in candidates:
+            if np.mean(self.signatures[index] == signature) >= self.threshold:
+                return False
+
+        for band, key in enumerate(band_keys):
+            self.buckets[band].setdefault(key, []).append(len(self.signatures))
+
+        self.signatures.append(signature)
+
+        return True
+
+
+class DatasetPreparer:
+
+    def __init__(self):
+        self.datasetCsvFilesLocation = ConfigVariables.localDatasetCsvFilesLocation
+        self.blob_extension = ConfigVariables.blobExtension
+        self.categories = ConfigVariables.predictionCategories
+        self.max_text_characters = ConfigVariables.datasetMaxTextCharacters
+        self.shard_count = ConfigVariables.datasetShardCount
+        self.min_shard_rows = ConfigVariables.datasetMinShardRows
+
+    def prepare(self, file_name: str, shard_count: int = None, balance: bool = False) -> str:
+        input_file_path = os.path.join(self.datasetCsvFilesLocation, f"{file_name}{self.blob_extension}")
+        output_directory = os.path.join(self.datasetCsvFilesLocation, f"{file_name}-prepared")
+
+        report = {"input_rows": 0, "empty_rows": 0, "unknown_labels": 0, "too_long_rows": 0,
+                  "exact_duplicates": 0, "near_duplicates": 0, "downsampled_rows": 0}
+
+        # The first pass keeps only row numbers, so the file is never held in memory
+        kept_rows = self.__deduplicate(input_file_path, report)
+        class_counts = Counter(kept_rows.values())
+
+        if balance and class_counts:
+            kept_rows = self.__balance(kept_rows, min(class_counts.values()))
+            report["downsampled_rows"] = sum(class_counts.values()) - len(kept_rows)
+
+        shard_count = max(1, min(shard_count or self.shard_count, math.ceil(len(kept_rows) / self.min_shard_rows)))
+        shard_file_paths = self.__write_shards(input_file_path, output_directory, file_name, kept_rows, shard_count)
+
+        report["output_rows"] = len(kept_rows)
+        report["input_classes"] = dict(class_counts)
+        report["output_classes"] = dict(Counter(kept_rows.values()))
+        report["shards"] = [os.path.basename(shard_file_path) for shard_file_path in shard_file_paths]
+
+        with open(os.path.join(output_directory, "report.json"), "w", encoding="UTF-8") as report_file:
+            json.dump(report, report_file, indent=2)
+
+        self.__print_report(report)
+
+        return output_directory
+
+    def __read_rows(self, input_file_path: str):
+        for row in ReviewFile(input_file_path).rows():
+            text = PredictionCache.normalize(row[0]) if row else ""
+            label = row[1].strip() if len(row) > 1 else ""
+
+            yield text, label
+
+    def __deduplicate(self, input_file_path: str, report: dict) -> dict:
+        exact_hashes = set()
+        near_duplicate_index = MinHashIndex(
+            ConfigVariables.datasetMinHashPermutations,
+            ConfigVariables.datasetMinHashBands,
+            ConfigVariables.datasetNearDuplicateThreshold,
+            ConfigVariables.datasetShingleSize
+        )
+        kept_rows = {}
+
+        for row_number, (text, label) in enumerate(self.__read_rows(input_file_path)):
+            report["input_rows"] += 1
+
+            if not text:
+                report["empty_rows"] += 1
+                continue
+
+            if label not in self.categories:
+                report["unknown_labels"] += 1
+                continue
+
+            if len(text) > self.max_text_characters:
+                report["too_long_rows"] += 1
+                continue
+
+            text_hash = hashlib.blake2b(text.lower().encode("UTF-8"), digest_size=16).digest()
+
+            if text_hash in exact_hashes:
+                report["exact_duplicates"] += 1
+                continue
+
+            exact_hashes.add(text_hash)
+
+            if not near_duplicate_index.add_if_new(text):
+                report["near_duplicates"] += 1
+                continue
+
+            kept_rows[row_number] = label
+
+        return kept_rows
+
+    def __balance(self, kept_rows: dict, rows_per_class: int) -> dict:
+        rows_by_class = {}
+
+        for row_number, label in kept_rows.items():
+            rows_by_class.setdefault(label, []).append(row_number)
+
+        generator = random.Random(0)
+        balanced_rows = set()
+
+        for row_numbers in rows_by_class.values():
+            balanced_rows.update(generator.sample(row_numbers, rows_per_class))
+
+        return {row_number: kept_rows[row_number] for row_number in sorted(balanced_rows)}
+
+    def __write_shards(self, input_file_path: str, output_directory: str, file_name: str, kept_rows: dict,
+                       shard_count: int) -> list:
+        shutil.rmtree(output_directory, ignore_errors=True)
+        os.makedirs(output_directory)
+
+        shard_file_paths = [
+            os.path.join(output_directory, f"{file_name}-{shard:05d}-of-{shard_count:05d}{self.blob_extension}")
+            for shard in range(shard_count)
+        ]
+        shard_files = [open(shard_file_path, "w", encoding="UTF-8", newline="") for shard_file_path in shard_file_paths]
+
+        try:
+            writers = [csv.writer(shard_file, lineterminator="\n") for shard_file in shard_files]
+            written_rows = 0
+
+            # The second pass writes the kept rows round-robin, so the shards have the same size
+            for row_number, (text, label) in enumerate(self.__read_rows(input_file_path)):
+                if row_number in kept_rows:
+                    writers[written_rows % shard_count].writerow((text, label))
+                    written_rows += 1
+        finally:
+            for shard_file in shard_files:
+                shard_file.close()
+
+        return shard_file_paths
+
+    def __print_report(self, report: dict):
+        print(f"\n{ConsoleColor.GREEN}Dataset has been prepared{ConsoleColor.END}")
+        print(f"Input rows: {report['input_rows']}, output rows: {report['output_rows']}")
+        print(f"Empty rows: {report['empty_rows']}, unknown labels: {report['unknown_labels']}, "
+              f"too long rows: {report['too_long_rows']}")
+        print(f"Exact duplicates: {report['exact_duplicates']}, near duplicates: {report['near_duplicates']}, "
+              f"downsampled rows: {report['downsampled_rows']}")
+        print(f"Classes: {report['output_classes']}")
+        print(f"Shards: {len(report['shards'])}\n")
@@ -0,0 +1,39 @@
+import io
+
+
+class FilePart(io.RawIOBase):
+    # A byte range of a file that reads like a file of its own, starting at position 0
+
+    def __init__(self, file_path: str, offset: int, size: int):
+        super().__init__()
+        self.file = open(file_path, "rb")
+        self.offset = offset
+        self.size = size
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        length = max(0, min(len(buffer), self.size - self.position))
+        self.file.seek(self.offset + self.position)
+        read_size = self.file.readinto(memoryview(buffer)[:length])
+        self.position += read_size
+
+        return read_size
+
+    def seek(self, position: int, whence: int = io.SEEK_SET) -> int:
+        start = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = max(0, start + position)
+
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def close(self):
+        self.file.close()
+        super().close()
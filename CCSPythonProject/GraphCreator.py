@@ -1,26 +1,196 @@
+import glob
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
 import matplotlib.pyplot as plt
 import pandas as pd
+from matplotlib.figure import Figure
+
+from ConfigVariables import ConfigVariables
+from ConsoleColor import ConsoleColor
+from ResultStore import ResultStore
+from ReviewFile import ReviewFile
+
+
+def count_categories(csv_file: str, start: int, end: int, chunk_size: int) -> pd.Series:
+    categories = pd.Series(dtype="int64")
+
+    # Result files have no header, the category is the last column
+    with ReviewFile(csv_file).open(start, end) as result_stream:
+        chunks = pd.read_csv(
+            result_stream,
+            header=None,
+            names=["review", "category"],
+            usecols=["category"],
+            chunksize=chunk_size,
+            on_bad_lines="skip"
+        )
+
+        # Only one chunk of the file is held in memory at a time
+        for chunk in chunks:
+            categories = categories.add(chunk["category"].value_counts(), fill_value=0)
+
+    return categories
 
 
 class GraphCreator:
 
-    def plot_review_categories(self, csv_file):
-        # Read the CSV file into a Pandas DataFrame
-        df = pd.read_csv(csv_file)
+    def __init__(self):
+        self.chunk_size = ConfigVariables.graphChunkSize
+        self.workers = ConfigVariables.graphWorkers
+        self.parallel_threshold = ConfigVariables.graphParallelThresholdBytes
+        self.process_start_method = ConfigVariables.processStartMethod
+        self.resultCsvFilesLocation = ConfigVariables.localResultCsvFilesLocation
+        self.chartsLocation = ConfigVariables.localChartsLocation
+        self.blobExtension = ConfigVariables.blobExtension
+        self.result_store = ResultStore()
+
+    def plot_review_categories(self, csv_file, output_file: str = None):
+        categories = self.count_review_categories(csv_file)
+
+        # Without an output file the chart is shown in a window, otherwise it is rendered off-screen
+        if output_file is None:
+            plt.bar(list(categories.index), list(categories.values))
+            plt.xlabel('Category')
+            plt.ylabel('Number of Reviews')
+            plt.title('Number of Reviews in Each Category')
+            plt.show()
+        else:
+            os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+            self.__save_bar_chart(categories, 'Number of Reviews in Each Category', output_file)
+
+    def count_review_categories(self, csv_file) -> pd.Series:
+        categories = pd.Series(dtype="int64")
+
+        # Parquet results are written as a directory of parts, only their category column is read
+        if os.path.isdir(csv_file):
+            for batch in self.result_store.scan(["category"], path=csv_file):
+                categories = categories.add(batch.column("category").to_pandas().value_counts(), fill_value=0)
+
+            return categories.astype("int64").sort_values(ascending=False)
+
+        review_file = ReviewFile(csv_file)
+
+        # Small files are not worth starting processes for
+        if review_file.size <= self.parallel_threshold or self.workers < 2:
+            categories = count_categories(csv_file, 0, None, self.chunk_size)
+
+            return categories.astype("int64").sort_values(ascending=False)
+
+        parts = review_file.split(self.workers)
+
+        # Every worker reads its own range of rows of the same file
+        with ProcessPoolExecutor(max_workers=len(parts),
+                                 mp_context=multiprocessing.get_context(self.process_start_method)) as executor:
+            for part_categories in executor.map(count_categories, [csv_file] * len(parts), *zip(*parts),
+                                                [self.chunk_size] * len(parts)):
+                categories = categories.add(part_categories, fill_value=0)
+
+        return categories.astype("int64").sort_values(ascending=False)
+
+    def aggregate_review_categories(self, csv_files: list, group_by: str = "film") -> pd.DataFrame:
+        groups = {}
+
+        for csv_file in csv_files:
+            group = self.__group_name(csv_file, group_by)
+            categories = self.count_review_categories(csv_file)
+            groups[group] = categories.add(groups[group], fill_value=0) if group in groups else categories
+
+        return pd.DataFrame(groups).T.fillna(0).astype("int64").sort_index()
+
+    def aggregate_stored_review_categories(self, group_by: str = "film", model_id: str = None, date_from: str = None,
+                                           date_to: str = None) -> pd.DataFrame:
+        group_column = {"film": "input_file", "day": "date", "model": "model"}[group_by]
+        batch_groups = [
+            batch.to_pandas().astype(str).groupby([group_column, "category"]).size()
+            for batch in self.result_store.scan(["category", group_column], model_id, date_from, date_to)
+        ]
+
+        if not batch_groups:
+            return pd.DataFrame(dtype="int64")
+
+        groups = pd.concat(batch_groups).groupby(level=[0, 1]).sum().unstack(fill_value=0)
+
+        # Runs on the same film are stored under different input files, so their counts are added together
+        if group_by == "film":
+            groups = groups.groupby([self.__film_name(input_file) for input_file in groups.index]).sum()
+
+        return groups.astype("int64").sort_index()
+
+    def plot_all_review_categories(self, csv_files: list = None, group_by: str = "film", image_format: str = "png") -> list:
+        if csv_files is None:
+            csv_files = sorted(glob.glob(os.path.join(self.resultCsvFilesLocation, f"*{self.blobExtension}")))
+
+        return self.__render_charts(self.aggregate_review_categories(csv_files, group_by), group_by, image_format)
+
+    def plot_all_stored_review_categories(self, group_by: str = "film", image_format: str = "png", model_id: str = None,
+                                          date_from: str = None, date_to: str = None) -> list:
+        aggregated_categories = self.aggregate_stored_review_categories(group_by, model_id, date_from, date_to)
+
+        return self.__render_charts(aggregated_categories, group_by, image_format)
+
+    def __render_charts(self, aggregated_categories: pd.DataFrame, group_by: str, image_format: str) -> list:
+        output_directory = os.path.join(self.chartsLocation, group_by)
+        os.makedirs(output_directory, exist_ok=True)
+        output_files = []
+
+        for group, categories in aggregated_categories.iterrows():
+            output_file = os.path.join(output_directory, f"{group}.{image_format}")
+            self.__save_bar_chart(categories, f"Number of Reviews in Each Category: {group}", output_file)
+            output_files.append(output_file)
+
+        summary_file = os.path.join(output_directory, f"summary.{image_format}")
+        self.__save_stacked_bar_chart(aggregated_categories, f"Number of Reviews per {group_by}", summary_file)
+        aggregated_categories.to_csv(os.path.join(output_directory, f"summary{self.blobExtension}"))
+        output_files.append(summary_file)
+
+        print(f"{ConsoleColor.GREEN}Number of rendered charts: {len(output_files)}{ConsoleColor.END} ({output_directory})")
+
+        return output_files
+
+    def __group_name(self, csv_file: str, group_by: str) -> str:
+        # Result files are named "YYYY-MM-DD-HH-MM-SS-<input file name>.csv"
+        file_name = os.path.basename(csv_file)
+
+        if group_by == "day":
+            return file_name[:10]
+
+        if group_by == "film":
+            return self.__film_name(file_name)
+
+        raise ValueError(f"Unknown grouping: {group_by}")
+
+    def __film_name(self, file_name: str) -> str:
+        # Prediction and scrape timestamps come before the name, scraped files are named "<film>-reviews"
+        name = re.sub(r"^(\d{4}(-\d{2}){5}-)+", "", file_name.removesuffix(self.blobExtension))
+
+        return name.removesuffix("-reviews") or name
 
-        # Add a column name to the second column
-        df.rename(columns={df.columns[1]: "category"}, inplace=True)
+    def __save_bar_chart(self, categories: pd.Series, title: str, output_file: str):
+        # A Figure without pyplot is rendered by the Agg backend and needs no display
+        figure = Figure()
+        axes = figure.subplots()
+        axes.bar(list(categories.index), list(categories.values))
+        axes.set_xlabel('Category')
+        axes.set_ylabel('Number of Reviews')
+        axes.set_title(title)
+        figure.savefig(output_file)
 
-        # Count the number of reviews in each category
-        categories = df['category'].value_counts()
+    def __save_stacked_bar_chart(self, aggregated_categories: pd.DataFrame, title: str, output_file: str):
+        figure = Figure(figsize=(max(6.4, 0.3 * len(aggregated_categories)), 4.8))
+        axes = figure.subplots()
+        bottom = pd.Series(0, index=aggregated_categories.index)
 
-        # Extract the category names and counts into separate lists
-        labels = list(categories.index)
-        counts = list(categories.values)
+        for category in aggregated_categories.columns:
+            axes.bar(list(aggregated_categories.index), list(aggregated_categories[category]), bottom=list(bottom),
+                     label=category)
+            bottom += aggregated_categories[category]
 
-        # Create a bar chart
-        plt.bar(labels, counts)
-        plt.xlabel('Category')
-        plt.ylabel('Number of Reviews')
-        plt.title('Number of Reviews in Each Category')
-        plt.show()
+        axes.set_ylabel('Number of Reviews')
+        axes.set_title(title)
+        axes.tick_params(axis='x', labelrotation=90)
+        axes.legend()
+        figure.tight_layout()
+        figure.savefig(output_file)
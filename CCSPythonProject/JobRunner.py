@@ -0,0 +1,101 @@
+import json
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ConfigVariables import ConfigVariables
+from ConsoleColor import ConsoleColor
+
+
+class JobRunner:
+    # "${stage_name}" in a command is replaced with the result of that stage
+    stage_reference = re.compile(r"\$\{([\w-]+)}")
+
+    def __init__(self, cli):
+        self.cli = cli
+
+    def run(self, job_file_path: str) -> dict:
+        with open(job_file_path, "r", encoding="UTF-8") as job_file:
+            job = json.load(job_file)
+
+        stages = {stage["name"]: stage for stage in job["stages"]}
+        dependencies = self.__dependencies(stages)
+        max_workers = job.get("max_workers", ConfigVariables.jobMaxWorkers)
+
+        results = {}
+        failed_stages = set()
+        waiting_stages = set(stages)
+        running_stages = {}
+
+        # A stage starts as soon as every stage it depends on has finished
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while waiting_stages or running_stages:
+                for name in sorted(waiting_stages):
+                    if dependencies[name] & failed_stages:
+                        waiting_stages.remove(name)
+                        failed_stages.add(name)
+                        print(f"{ConsoleColor.RED}Stage {name} has been skipped{ConsoleColor.END}")
+
+                    elif dependencies[name] <= results.keys():
+                        waiting_stages.remove(name)
+                        command = self.__resolve(stages[name]["command"], results)
+                        running_stages[executor.submit(self.cli.execute, command)] = name
+                        print(f"{ConsoleColor.GREEN}Stage {name} has been started{ConsoleColor.END}")
+
+                if not running_stages:
+                    break
+
+                finished, _ = wait(running_stages, return_when=FIRST_COMPLETED)
+
+                for future in finished:
+                    name = running_stages.pop(future)
+
+                    try:
+                        results[name] = future.result()
+                        print(f"{ConsoleColor.GREEN}Stage {name} has been finished{ConsoleColor.END}")
+                    except Exception as ex:
+                        failed_stages.add(name)
+                        print(f"{ConsoleColor.RED}Stage {name} has failed: {ex}{ConsoleColor.END}")
+
+        if failed_stages:
+            raise RuntimeError(f"Failed or skipped stages: {', '.join(sorted(failed_stages))}")
+
+        return results
+
+    def __dependencies(self, stages: dict) -> dict:
+        dependencies = {}
+
+        for name, stage in stages.items():
+            # Commands are checked before anything runs, argparse exits on invalid ones
+            try:
+                self.cli.parse(stage["command"])
+            except SystemExit:
+                raise ValueError(f"Stage {name} has an invalid command: {stage['command']}")
+
+            referenced_stages = {
+                reference
+                for argument in stage["command"]
+                for reference in self.stage_reference.findall(argument)
+            }
+            dependencies[name] = set(stage.get("depends_on", [])) | referenced_stages
+
+            for dependency in dependencies[name]:
+                if dependency not in stages:
+                    raise ValueError(f"Stage {name} depends on an unknown stage {dependency}")
+
+        # Stages are removed once all their dependencies are removed, the ones left form a cycle
+        remaining_stages = dict(dependencies)
+
+        while remaining_stages:
+            ready_stages = [name for name, stage_dependencies in remaining_stages.items()
+                            if not stage_dependencies & remaining_stages.keys()]
+
+            if not ready_stages:
+                raise ValueError(f"Stages depend on each other: {', '.join(sorted(remaining_stages))}")
+
+            for name in ready_stages:
+                del remaining_stages[name]
+
+        return dependencies
+
+    def __resolve(self, command: list, results: dict) -> list:
+        return [self.stage_reference.sub(lambda match: str(results[match.group(1)]), argument) for argument in command]
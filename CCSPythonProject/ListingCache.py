@@ -0,0 +1,38 @@
+import threading
+import time
+
+from ConfigVariables import ConfigVariables
+from Metrics import metrics
+
+
+class ListingCache:
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get_or_load(self, key: tuple, load) -> list:
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry and entry[0] > time.monotonic():
+                metrics.increment("listing_cache_hits")
+                return entry[1]
+
+        items = load()
+
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, items)
+
+        return items
+
+    def invalidate(self, kind: str):
+        # The first element of every key is the kind of the listed resources
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == kind]:
+                del self.entries[key]
+
+
+# Shared by StorageAPI and NaturalLanguageAPI, so a write in one of them invalidates the listings of both
+listing_cache = ListingCache(ConfigVariables.listingCacheTtlSeconds)
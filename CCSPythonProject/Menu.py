@@ -7,11 +7,14 @@ class Menu:
         self.buttons = (
             f"{ConsoleColor.VIOLET}* Web scraping{ConsoleColor.END}",
             f"{ConsoleColor.YELLOW}1. Get reviews from website{ConsoleColor.END} input: link",
+            f"{ConsoleColor.YELLOW}16. Get new reviews of many films{ConsoleColor.END} input: file_name (one link per line)",
             f"{ConsoleColor.VIOLET}* Google Cloud Storage operations (blobs){ConsoleColor.END}",
             f"{ConsoleColor.YELLOW}2. Add a blob{ConsoleColor.END} input: file_name, blob_name",
             f"{ConsoleColor.YELLOW}3. Display all blobs{ConsoleColor.END} displays: blob_name",
             f"{ConsoleColor.YELLOW}4. Remove a blob{ConsoleColor.END} input: blob_name",
+            f"{ConsoleColor.YELLOW}17. Add blobs from a folder{ConsoleColor.END} input: folder_path, blob_prefix",
             f"{ConsoleColor.VIOLET}* Vertex AI operations (datasets){ConsoleColor.END}",
+            f"{ConsoleColor.YELLOW}21. Prepare a dataset file{ConsoleColor.END} input: file_name",
             f"{ConsoleColor.YELLOW}5. Create and fill the dataset{ConsoleColor.END} input: dataset_name, blob_name",
             f"{ConsoleColor.YELLOW}6. Display all datasets{ConsoleColor.END} displays: dataset_name, dataset_id etc.",
             f"{ConsoleColor.YELLOW}7. Remove a dataset{ConsoleColor.END} input: dataset_id",
@@ -22,8 +25,11 @@ class Menu:
             f"{ConsoleColor.YELLOW}11. Apply model prediction{ConsoleColor.END} input: model_id, file_name",
             f"{ConsoleColor.YELLOW}12. Display all models{ConsoleColor.END} displays: model_name, model_id etc.",
             f"{ConsoleColor.YELLOW}13. Remove a model{ConsoleColor.END} input: model_id",
+            f"{ConsoleColor.YELLOW}18. Create and train a local model{ConsoleColor.END} input: model_name, file_name",
+            f"{ConsoleColor.YELLOW}19. Apply local model prediction{ConsoleColor.END} input: model_name, file_name",
             f"{ConsoleColor.VIOLET}* Other {ConsoleColor.END}",
             f"{ConsoleColor.YELLOW}14. Display all current operations {ConsoleColor.END}",
+            f"{ConsoleColor.YELLOW}20. Render charts of all prediction results{ConsoleColor.END} input: film or day",
             f"{ConsoleColor.BLUE}15. Exit{ConsoleColor.END}"
         )
 
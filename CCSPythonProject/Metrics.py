@@ -0,0 +1,134 @@
+import bisect
+import contextlib
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+
+from ConfigVariables import ConfigVariables
+
+
+class Metrics:
+    # Span of the running operation, so the spans started inside it become its children
+    current_span = contextvars.ContextVar("current_span", default=None)
+
+    def __init__(self, histogram_buckets: tuple, max_spans: int):
+        self.histogram_buckets = histogram_buckets
+        self.max_spans = max_spans
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.spans = []
+        self.trace_id = secrets.token_hex(16)
+
+    def increment(self, name: str, amount: float = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float):
+        bucket = bisect.bisect_left(self.histogram_buckets, seconds)
+
+        with self.lock:
+            histogram = self.histograms.setdefault(name, {
+                "buckets": [0] * (len(self.histogram_buckets) + 1),
+                "sum": 0.0,
+                "count": 0
+            })
+            histogram["buckets"][bucket] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+
+    @contextlib.contextmanager
+    def timer(self, name: str, **attributes):
+        span = {
+            "traceId": self.trace_id,
+            "spanId": secrets.token_hex(8),
+            "parentSpanId": self.current_span.get() or "",
+            "name": name,
+            "startTimeUnixNano": time.time_ns(),
+            "attributes": attributes
+        }
+        token = self.current_span.set(span["spanId"])
+        start = time.perf_counter()
+
+        try:
+            yield span["attributes"]
+        except BaseException as ex:
+            span["status"] = {"code": "STATUS_CODE_ERROR", "message": str(ex)}
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start)
+            self.current_span.reset(token)
+            span["endTimeUnixNano"] = time.time_ns()
+
+            with self.lock:
+                # Only the first spans are kept, a long run must not grow without bound
+                if len(self.spans) < self.max_spans:
+                    self.spans.append(span)
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.spans.clear()
+
+    def export_prometheus(self, file_path: str):
+        self.__write(file_path, self.prometheus_text())
+
+    def prometheus_text(self) -> str:
+        lines = []
+
+        with self.lock:
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE ccs_{name}_total counter")
+                lines.append(f"ccs_{name}_total {value}")
+
+            for name, histogram in sorted(self.histograms.items()):
+                lines.append(f"# TYPE ccs_{name}_seconds histogram")
+                cumulative_count = 0
+
+                for upper_bound, count in zip(self.histogram_buckets + ("+Inf",), histogram["buckets"]):
+                    cumulative_count += count
+                    lines.append(f"ccs_{name}_seconds_bucket{{le=\"{upper_bound}\"}} {cumulative_count}")
+
+                lines.append(f"ccs_{name}_seconds_sum {histogram['sum']}")
+                lines.append(f"ccs_{name}_seconds_count {histogram['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def export_spans(self, file_path: str):
+        with self.lock:
+            spans = [
+                {
+                    **span,
+                    "attributes": [
+                        {"key": key, "value": {"stringValue": str(value)}} for key, value in span["attributes"].items()
+                    ]
+                }
+                for span in self.spans
+            ]
+
+        # Same layout as the OTLP JSON export of OpenTelemetry
+        trace = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "ccs"}}]},
+                "scopeSpans": [{"scope": {"name": "ccs"}, "spans": spans}]
+            }]
+        }
+
+        self.__write(file_path, json.dumps(trace, indent=2))
+
+    def __write(self, file_path: str, content: str):
+        # Scrapers of the textfile collector must never see a half written file
+        temporary_file_path = file_path + ".tmp"
+
+        with open(temporary_file_path, "w", encoding="UTF-8") as metrics_file:
+            metrics_file.write(content)
+
+        os.replace(temporary_file_path, file_path)
+
+
+# Shared by every API object, so one export covers the whole run
+metrics = Metrics(ConfigVariables.metricsHistogramBuckets, ConfigVariables.metricsMaxSpans)
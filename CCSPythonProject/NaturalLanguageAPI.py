@@ -1,11 +1,17 @@
-import csv
+import json
 import os
-from time import sleep
+from itertools import islice
 
+from ClientRegistry import ClientRegistry
 from ConfigVariables import ConfigVariables
 from ConsoleColor import ConsoleColor
+from ListingCache import listing_cache
+from Metrics import metrics
+from OperationTracker import OperationTracker
 from google.cloud import automl
-from StorageAPI import StorageAPI
+from PredictionBackend import AutoMlPredictionBackend, LocalPredictionBackend, PredictionBackend
+from ResultStore import CsvResultWriter, ParquetResultWriter, ResultStore, ResultWriter
+from ReviewFile import ReviewFile
 from datetime import datetime
 
 
@@ -19,12 +25,21 @@ class NaturalLanguageAPI:
         self.blob_extension = ConfigVariables.blobExtension
         self.predictionCsvFilesLocation = ConfigVariables.localPredictionCsvFilesLocation
         self.resultCsvFilesLocation = ConfigVariables.localResultCsvFilesLocation
-
-        self.client = automl.AutoMlClient()
-        self.bucket = StorageAPI().bucket
+        self.checkpoint_extension = ConfigVariables.checkpointExtension
+        self.result_store = ResultStore()
+        self.localModelsLocation = ConfigVariables.localModelsLocation
+        self.datasetCsvFilesLocation = ConfigVariables.localDatasetCsvFilesLocation
+        self.listing_page_size = ConfigVariables.automlListingPageSize
+
+        self.client = ClientRegistry.automl_client()
+        self.operation_tracker = OperationTracker(
+            self.client._transport.operations_client,
+            ConfigVariables.operationsFile
+        )
+        self.bucket_name = ConfigVariables.googleCloudBucketName
         self.timeoutSeconds = 5
 
-    def create_and_fill_dataset(self, dataset_display_name: str, blob_name: str):
+    def create_and_fill_dataset(self, dataset_display_name: str, blob_name: str, wait: bool = False) -> str:
         metadata = automl.TextClassificationDatasetMetadata(
             classification_type=automl.ClassificationType.MULTICLASS
         )
@@ -40,33 +55,40 @@ class NaturalLanguageAPI:
             timeout=self.timeoutSeconds
         )
 
-        print(f"\n{ConsoleColor.GREEN}Dataset created successfully{ConsoleColor.END} {response.result()}")
+        dataset = response.result()
+        dataset_id = dataset.name.split('/')[-1]
 
-        self.__import_data_to_dataset(response.result().name.split('/')[-1], blob_name)
+        print(f"\n{ConsoleColor.GREEN}Dataset created successfully{ConsoleColor.END} {dataset}")
 
-    def display_datasets(self):
-        request = automl.ListDatasetsRequest(
-            parent=self.project_location,
-            filter=""
-        )
+        listing_cache.invalidate("datasets")
 
-        response = self.client.list_datasets(
-            request=request,
-            timeout=self.timeoutSeconds
+        import_operation_name = self.__import_data_to_dataset(dataset_id, blob_name)
+
+        if wait:
+            self.operation_tracker.wait(import_operation_name)
+
+        return dataset_id
+
+    def display_datasets(self, filter_expression: str = "", page_size: int = None, output_json: bool = False) -> list:
+        datasets = listing_cache.get_or_load(
+            ("datasets", self.project_location, filter_expression),
+            lambda: self.__load_datasets(filter_expression, page_size or self.listing_page_size)
         )
 
-        number_of_datasets: int = 0
+        if output_json:
+            print(json.dumps(datasets, indent=2))
+            return datasets
 
-        for dataset in response:
+        for dataset in datasets:
             print()
-            print(f"Dataset id: {dataset.name.split('/')[-1]}")
-            print(f"Dataset name: {dataset.display_name}")
-            print(f"Dataset full name: {dataset.name}")
-            print(f"Dataset create time: {dataset.create_time}")
+            print(f"Dataset id: {dataset['id']}")
+            print(f"Dataset name: {dataset['name']}")
+            print(f"Dataset full name: {dataset['full_name']}")
+            print(f"Dataset create time: {dataset['create_time']}")
 
-            number_of_datasets += 1
+        print(f"\n{ConsoleColor.GREEN}Number of displayed datasets: {len(datasets)}{ConsoleColor.END}\n")
 
-        print(f"\n{ConsoleColor.GREEN}Number of displayed datasets: {number_of_datasets}{ConsoleColor.END}\n")
+        return datasets
 
     def remove_dataset(self, dataset_id: str):
         dataset_full_id = self.client.dataset_path(
@@ -82,7 +104,9 @@ class NaturalLanguageAPI:
 
         print(f"\n{ConsoleColor.GREEN}Dataset deleted successfully{ConsoleColor.END} {response.result()}\n")
 
-    def create_and_train_model(self, model_display_name: str, dataset_id: str):
+        listing_cache.invalidate("datasets")
+
+    def create_and_train_model(self, model_display_name: str, dataset_id: str, wait: bool = False) -> str:
         metadata = automl.TextClassificationModelMetadata()
 
         print(f"{ConsoleColor.GREEN}Creation and training of the model (in the background)...{ConsoleColor.END}")
@@ -93,12 +117,30 @@ class NaturalLanguageAPI:
             text_classification_model_metadata=metadata,
         )
 
-        self.client.create_model(
+        operation = self.client.create_model(
             parent=self.project_location,
             model=model,
             timeout=None
         )
 
+        listing_cache.invalidate("models")
+
+        self.operation_tracker.track(
+            operation.operation.name,
+            "train",
+            f"model {model_display_name} on dataset {dataset_id}",
+            lambda finished_operation: print(f"{ConsoleColor.GREEN}Model has been trained{ConsoleColor.END}")
+        )
+
+        if not wait:
+            return operation.operation.name
+
+        trained_model = automl.Model.deserialize(self.operation_tracker.wait(operation.operation.name).response.value)
+        model_id = trained_model.name.split('/')[-1]
+        print(f"Model id: {model_id}")
+
+        return model_id
+
     def evaluate_model(self, model_id: str):
         model_full_id = self.client.model_path(
             self.project_id,
@@ -121,96 +163,125 @@ class NaturalLanguageAPI:
                 )
             )
 
-    def deploy_model(self, model_id: str):
+    def deploy_model(self, model_id: str, wait: bool = False) -> str:
+        self.__check_model_id(model_id)
+
         model_full_id = self.client.model_path(
             self.project_id,
             self.cloud_region,
             model_id
         )
 
-        self.client.deploy_model(
+        operation = self.client.deploy_model(
             name=model_full_id,
             timeout=None
         )
 
-    def apply_model_prediction(self, model_id: str, file_name: str) -> str:
-        full_file_name = f"{file_name}{self.blob_extension}"
-        prediction_client = automl.PredictionServiceClient()
-
-        model_full_id = automl.AutoMlClient.model_path(
-            self.project_id,
-            self.cloud_region,
-            model_id
+        self.operation_tracker.track(
+            operation.operation.name,
+            "deploy",
+            f"model {model_id}",
+            lambda finished_operation: print(f"{ConsoleColor.GREEN}Model has been deployed{ConsoleColor.END}")
         )
 
-        print(f"{ConsoleColor.GREEN}Model prediction in progress, please do not close the program...{ConsoleColor.END}")
+        if wait:
+            self.operation_tracker.wait(operation.operation.name)
 
-        now = datetime.now()
-        output_file_name = now.strftime("%Y-%m-%d") + "-" + now.strftime("%H-%M-%S") + "-" + full_file_name
-        output_file_path = os.path.join(self.resultCsvFilesLocation, output_file_name)
+        return model_id
 
-        output_file = open(output_file_path, "a", encoding="UTF-8")
+    @metrics.timer("apply_model_prediction")
+    def apply_model_prediction(self, model_id: str, file_name: str, backend: str = None,
+                               result_format: str = None) -> str:
+        self.__check_model_id(model_id)
 
-        with open(os.path.join(self.predictionCsvFilesLocation, full_file_name), "r", encoding="UTF-8") as csv_file:
-            reader = csv.reader(csv_file)
-            data = [row[0] for row in reader]
+        full_file_name = f"{file_name}{self.blob_extension}"
 
-        for i, snippet in enumerate(data):
-            # Prediction is slowed down to avoid errors from Vertex AI
-            sleep(0.5)
+        os.makedirs(self.resultCsvFilesLocation, exist_ok=True)
 
-            text_snippet = automl.TextSnippet(
-                content=snippet,
-                mime_type="text/plain"
-            )
+        input_file_path = os.path.join(self.predictionCsvFilesLocation, full_file_name)
+        checkpoint_file_path = os.path.join(
+            self.resultCsvFilesLocation,
+            f"{model_id}-{full_file_name}{self.checkpoint_extension}"
+        )
 
-            payload = automl.ExamplePayload(
-                text_snippet=text_snippet
-            )
+        checkpoint = self.__load_checkpoint(checkpoint_file_path)
 
-            response = prediction_client.predict(
-                name=model_full_id,
-                payload=payload
-            )
+        if checkpoint:
+            result_format = checkpoint["format"]
+            output_file_path = checkpoint["output_file"]
+            committed_rows = checkpoint["committed_rows"]
+            position = checkpoint["position"]
 
-            categories = {
-                "positive": 0,
-                "negative": 0,
-                "controversial": 0
-            }
+            print(f"{ConsoleColor.GREEN}Resuming model prediction from row {committed_rows}...{ConsoleColor.END}")
+        else:
+            result_format = result_format or ConfigVariables.predictionResultFormat
+            now = datetime.now()
+            output_file_path = self.__output_file_path(result_format, model_id, now, full_file_name)
+            committed_rows = 0
+            position = None
+
+            print(f"{ConsoleColor.GREEN}Model prediction in progress, please do not close the program...{ConsoleColor.END}")
+
+        result_writer = self.__create_result_writer(result_format, output_file_path, full_file_name, committed_rows,
+                                                    position)
+        prediction_backend = self.__create_prediction_backend(backend or ConfigVariables.predictionBackend, model_id)
+        snippets = islice(self.__read_snippets(input_file_path), committed_rows, None)
 
-            for annotation_payload in response.payload:
-                categories[annotation_payload.display_name] = annotation_payload.classification.score
+        try:
+            self.__save_checkpoint(checkpoint_file_path, result_writer, output_file_path)
 
-            max_value_key = max(categories, key=categories.get)
-            output_file.write(f"{snippet.replace(',', '')},{max_value_key}\n")
+            for snippet, categories, latency_seconds in prediction_backend.predict_stream(snippets):
+                if result_writer.write(snippet, categories, latency_seconds):
+                    self.__save_checkpoint(checkpoint_file_path, result_writer, output_file_path)
+        finally:
+            prediction_backend.close()
 
-        output_file.close()
+        result_writer.close()
+        os.remove(checkpoint_file_path)
+
+        print(prediction_backend.summary())
         print("Model prediction has been finished, the result file has been saved")
 
         return output_file_path
 
-    def display_models(self):
-        request = automl.ListModelsRequest(
-            parent=self.project_location
+    def create_prediction_backend(self, model_id: str, backend: str = None) -> PredictionBackend:
+        self.__check_model_id(model_id)
+
+        return self.__create_prediction_backend(backend or ConfigVariables.predictionBackend, model_id)
+
+    @metrics.timer("train_local_model")
+    def create_and_train_local_model(self, model_name: str, file_name: str) -> str:
+        print(f"{ConsoleColor.GREEN}Training of the local model in progress...{ConsoleColor.END}")
+
+        accuracy = LocalPredictionBackend.train(
+            os.path.join(self.datasetCsvFilesLocation, f"{file_name}{self.blob_extension}"),
+            self.__local_model_file_path(model_name)
         )
 
-        response = self.client.list_models(
-            request=request
+        print(f"{ConsoleColor.GREEN}Local model has been trained{ConsoleColor.END} Test accuracy: {accuracy:.3f}")
+
+        return model_name
+
+    def display_models(self, filter_expression: str = "", page_size: int = None, output_json: bool = False) -> list:
+        models = listing_cache.get_or_load(
+            ("models", self.project_location, filter_expression),
+            lambda: self.__load_models(filter_expression, page_size or self.listing_page_size)
         )
 
-        number_of_models: int = 0
+        if output_json:
+            print(json.dumps(models, indent=2))
+            return models
 
-        for model in response:
+        for model in models:
             print()
-            print(f"Model name: {model.display_name}")
-            print(f"Model id: {model.name.split('/')[-1]}")
-            print(f"Model full name: {model.name}")
-            print(f"Model create time: {model.create_time}")
+            print(f"Model name: {model['name']}")
+            print(f"Model id: {model['id']}")
+            print(f"Model full name: {model['full_name']}")
+            print(f"Model create time: {model['create_time']}")
 
-            number_of_models += 1
+        print(f"\n{ConsoleColor.GREEN}Number of displayed models: {len(models)}{ConsoleColor.END}\n")
 
-        print(f"\n{ConsoleColor.GREEN}Number of displayed models: {number_of_models}{ConsoleColor.END}\n")
+        return models
 
     def remove_model(self, model_id: str):
         model_full_id = self.client.model_path(
@@ -225,29 +296,191 @@ class NaturalLanguageAPI:
 
         print(f"\n{ConsoleColor.GREEN}Model removed successfully{ConsoleColor.END}\n {response.result()}")
 
+        listing_cache.invalidate("models")
+
     def display_current_operations(self):
-        request = self.client._transport.operations_client.list_operations(
-            name=self.project_location, filter_="", timeout=5
+        # Only the operations started by this program are polled, the project is not scanned
+        print("List of operations:")
+
+        for operation_name, operation in self.operation_tracker.tracked_operations().items():
+            if not self.operation_tracker.poll(operation_name).done:
+                print("Name: {}".format(operation_name))
+                print(f"{operation['kind']}: {operation['description']}, started at {operation['start_time']}")
+
+    def wait_for_operations(self, operation_names: list = None):
+        print(f"{ConsoleColor.GREEN}Waiting for the operations to finish...{ConsoleColor.END}")
+
+        operations = self.operation_tracker.wait_all(operation_names)
+
+        print(f"{ConsoleColor.GREEN}Number of finished operations: {len(operations)}{ConsoleColor.END}")
+
+    @metrics.timer("list_datasets")
+    def __load_datasets(self, filter_expression: str, page_size: int) -> list:
+        # The filter is applied by the server, e.g. "text_classification_dataset_metadata:*"
+        request = automl.ListDatasetsRequest(
+            parent=self.project_location,
+            filter=filter_expression,
+            page_size=page_size
         )
 
-        print("List of operations:")
-        for operation in request:
-            if not operation.done:
-                print("Name: {}".format(operation.name))
-                print(operation.metadata)
+        response = self.client.list_datasets(
+            request=request,
+            timeout=self.timeoutSeconds
+        )
+
+        return [
+            {
+                "id": dataset.name.split('/')[-1],
+                "name": dataset.display_name,
+                "full_name": dataset.name,
+                "create_time": str(dataset.create_time)
+            }
+            for dataset in response
+        ]
+
+    @metrics.timer("list_models")
+    def __load_models(self, filter_expression: str, page_size: int) -> list:
+        # The filter is applied by the server, e.g. "dataset_id=TCN123"
+        request = automl.ListModelsRequest(
+            parent=self.project_location,
+            filter=filter_expression,
+            page_size=page_size
+        )
+
+        response = self.client.list_models(
+            request=request
+        )
+
+        return [
+            {
+                "id": model.name.split('/')[-1],
+                "name": model.display_name,
+                "full_name": model.name,
+                "create_time": str(model.create_time)
+            }
+            for model in response
+        ]
 
     def __import_data_to_dataset(self, dataset_id: str, blob_name: str):
         dataset_full_id = self.client.dataset_path(self.project_id, self.cloud_region, dataset_id)
-        blob_path = f"gs://{self.bucket.name}/{blob_name}{self.blob_extension}"
+        blob_paths = self.__blob_paths(blob_name)
 
         print(f"{ConsoleColor.GREEN}Importing data to the dataset (in the background)...{ConsoleColor.END}")
 
+        # Shards of a prepared dataset are imported together and read in parallel
         input_config = automl.InputConfig(
-            gcs_source=automl.GcsSource(input_uris=[blob_path]),
+            gcs_source=automl.GcsSource(input_uris=blob_paths),
         )
 
-        self.client.import_data(
+        operation = self.client.import_data(
             name=dataset_full_id,
             input_config=input_config,
             timeout=None
         )
+
+        self.operation_tracker.track(
+            operation.operation.name,
+            "import",
+            f"{', '.join(blob_paths)} to dataset {dataset_id}",
+            lambda finished_operation: print(f"{ConsoleColor.GREEN}Data has been imported to the dataset{ConsoleColor.END}")
+        )
+
+        return operation.operation.name
+
+    def __blob_paths(self, blob_name: str) -> list:
+        if not blob_name.endswith("/"):
+            return [f"gs://{self.bucket_name}/{blob_name}{self.blob_extension}"]
+
+        blobs = ClientRegistry.storage_client().list_blobs(
+            self.bucket_name,
+            prefix=blob_name,
+            fields="items(name),nextPageToken"
+        )
+        blob_paths = [f"gs://{self.bucket_name}/{blob.name}" for blob in blobs if blob.name.endswith(self.blob_extension)]
+
+        if not blob_paths:
+            raise ValueError(f"No blobs found under {blob_name}")
+
+        return blob_paths
+
+    def __check_model_id(self, model_id: str):
+        # Training without waiting gives the name of its operation, e.g. to a job stage "deploy ${train}"
+        if "/operations/" in model_id:
+            raise ValueError(f"{model_id} is an operation, not a model id. "
+                             f"Train with --wait or wait for the operation to get the model id")
+
+    def __create_prediction_backend(self, backend: str, model_id: str):
+        if backend == LocalPredictionBackend.name:
+            return LocalPredictionBackend(self.__local_model_file_path(model_id))
+
+        if backend == AutoMlPredictionBackend.name:
+            model_full_id = automl.AutoMlClient.model_path(
+                self.project_id,
+                self.cloud_region,
+                model_id
+            )
+
+            return AutoMlPredictionBackend(ClientRegistry.prediction_client(), model_full_id)
+
+        raise ValueError(f"Unknown prediction backend: {backend}")
+
+    def __output_file_path(self, result_format: str, model_id: str, now: datetime, full_file_name: str) -> str:
+        if result_format == ParquetResultWriter.name:
+            run_directory = self.result_store.run_directory(
+                model_id,
+                now.strftime("%Y-%m-%d"),
+                now.strftime("%H-%M-%S") + "-" + full_file_name[:-len(self.blob_extension)]
+            )
+            os.makedirs(run_directory, exist_ok=True)
+
+            return run_directory
+
+        output_file_name = now.strftime("%Y-%m-%d") + "-" + now.strftime("%H-%M-%S") + "-" + full_file_name
+
+        return os.path.join(self.resultCsvFilesLocation, output_file_name)
+
+    def __create_result_writer(self, result_format: str, output_file_path: str, full_file_name: str,
+                               committed_rows: int, position: int) -> ResultWriter:
+        if result_format == ParquetResultWriter.name:
+            return ParquetResultWriter(output_file_path, full_file_name, committed_rows, position or 0)
+
+        if result_format == CsvResultWriter.name:
+            return CsvResultWriter(output_file_path, committed_rows, position)
+
+        raise ValueError(f"Unknown result format: {result_format}")
+
+    def __local_model_file_path(self, model_name: str) -> str:
+        return os.path.join(self.localModelsLocation, f"{model_name}.pickle")
+
+    def __read_snippets(self, input_file_path: str):
+        for row in ReviewFile(input_file_path).rows():
+            if row:
+                yield row[0]
+
+    def __load_checkpoint(self, checkpoint_file_path: str):
+        if not os.path.exists(checkpoint_file_path):
+            return None
+
+        with open(checkpoint_file_path, "r", encoding="UTF-8") as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+
+        if not os.path.exists(checkpoint["output_file"]):
+            return None
+
+        return checkpoint
+
+    def __save_checkpoint(self, checkpoint_file_path: str, result_writer: ResultWriter, output_file_path: str):
+        checkpoint = {
+            "format": result_writer.name,
+            "output_file": output_file_path,
+            "committed_rows": result_writer.committed_rows,
+            "position": result_writer.position()
+        }
+
+        # The checkpoint is replaced atomically so an interrupted write never corrupts it
+        temporary_file_path = checkpoint_file_path + ".tmp"
+
+        with open(temporary_file_path, "w", encoding="UTF-8") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+
+        os.replace(temporary_file_path, checkpoint_file_path)
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from google.api_core import exceptions
+
+from ConfigVariables import ConfigVariables
+from Metrics import metrics
+
+
+class OperationTracker:
+
+    def __init__(self, operations_client, tracker_file_path: str):
+        self.operations_client = operations_client
+        self.tracker_file_path = tracker_file_path
+        self.initial_poll_seconds = ConfigVariables.operationPollInitialSeconds
+        self.max_poll_seconds = ConfigVariables.operationPollMaxSeconds
+        self.poll_multiplier = ConfigVariables.operationPollMultiplier
+        self.lock = threading.Lock()
+        self.callbacks = {}
+        self.operations = {}
+
+        if os.path.exists(tracker_file_path):
+            with open(tracker_file_path, "r", encoding="UTF-8") as tracker_file:
+                self.operations = json.load(tracker_file)
+
+    def track(self, operation_name: str, kind: str, description: str, callback=None):
+        with self.lock:
+            self.operations[operation_name] = {
+                "kind": kind,
+                "description": description,
+                "start_time": datetime.now().isoformat(timespec="seconds")
+            }
+
+            if callback:
+                self.callbacks.setdefault(operation_name, []).append(callback)
+
+            self.__save()
+
+    def add_callback(self, operation_name: str, callback):
+        with self.lock:
+            self.callbacks.setdefault(operation_name, []).append(callback)
+
+    def tracked_operations(self) -> dict:
+        with self.lock:
+            return dict(self.operations)
+
+    def poll(self, operation_name: str):
+        with metrics.timer("operation_poll", operation=operation_name):
+            operation = self.operations_client.get_operation(operation_name)
+
+        if operation.done:
+            self.__complete(operation)
+
+        return operation
+
+    def wait(self, operation_name: str):
+        poll_seconds = self.initial_poll_seconds
+
+        # Long-running operations take minutes to hours, so polls get rarer the longer they run
+        while True:
+            operation = self.poll(operation_name)
+
+            if operation.done:
+                return self.__result(operation)
+
+            time.sleep(poll_seconds)
+            poll_seconds = min(poll_seconds * self.poll_multiplier, self.max_poll_seconds)
+
+    async def wait_async(self, operation_name: str):
+        poll_seconds = self.initial_poll_seconds
+
+        while True:
+            operation = await asyncio.to_thread(self.poll, operation_name)
+
+            if operation.done:
+                return self.__result(operation)
+
+            await asyncio.sleep(poll_seconds)
+            poll_seconds = min(poll_seconds * self.poll_multiplier, self.max_poll_seconds)
+
+    async def wait_all_async(self, operation_names: list) -> list:
+        return await asyncio.gather(*(self.wait_async(operation_name) for operation_name in operation_names))
+
+    def wait_all(self, operation_names: list = None) -> list:
+        if operation_names is None:
+            operation_names = list(self.tracked_operations())
+
+        return asyncio.run(self.wait_all_async(operation_names))
+
+    def __complete(self, operation):
+        with self.lock:
+            callbacks = self.callbacks.pop(operation.name, [])
+
+            if self.operations.pop(operation.name, None) is not None:
+                self.__save()
+
+        for callback in callbacks:
+            callback(operation)
+
+    def __result(self, operation):
+        if operation.error.code:
+            raise exceptions.from_grpc_status(operation.error.code, operation.error.message)
+
+        return operation
+
+    def __save(self):
+        temporary_file_path = self.tracker_file_path + ".tmp"
+
+        with open(temporary_file_path, "w", encoding="UTF-8") as tracker_file:
+            json.dump(self.operations, tracker_file, indent=2)
+
+        os.replace(temporary_file_path, self.tracker_file_path)
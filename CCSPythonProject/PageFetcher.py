@@ -0,0 +1,66 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ConfigVariables import ConfigVariables
+from Metrics import metrics
+
+
+class PageFetcher:
+
+    def __init__(self, headers: dict):
+        self.timeout = ConfigVariables.scraperTimeoutSeconds
+        self.workers = ConfigVariables.scraperWorkers
+        self.requests_per_host = ConfigVariables.scraperRequestsPerHost
+
+        # Failed pages are retried with exponential backoff, Retry-After of 429 responses is respected
+        retry = Retry(
+            total=ConfigVariables.scraperMaxRetries,
+            backoff_factor=ConfigVariables.scraperBackoffSeconds,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",)
+        )
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.host_semaphores = {}
+        self.host_semaphores_lock = threading.Lock()
+
+    def fetch(self, url: str, headers: dict = None) -> requests.Response:
+        with self.__host_semaphore(url), metrics.timer("fetch", url=url) as attributes:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            attributes["status"] = response.status_code
+
+        # Retries of urllib3 are hidden inside the session, the response keeps their history
+        if response.raw.retries:
+            metrics.increment("fetch_retries", len(response.raw.retries.history))
+
+        metrics.increment("fetched_bytes", len(response.content))
+        response.raise_for_status()
+
+        return response
+
+    def fetch_all(self, urls: list) -> list:
+        # Executor.map returns the pages in the order of the urls
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return [response.text for response in executor.map(self.fetch, urls)]
+
+    def close(self):
+        self.session.close()
+
+    def __host_semaphore(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc
+
+        with self.host_semaphores_lock:
+            if host not in self.host_semaphores:
+                self.host_semaphores[host] = threading.Semaphore(self.requests_per_host)
+
+            return self.host_semaphores[host]
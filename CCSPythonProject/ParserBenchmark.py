@@ -0,0 +1,64 @@
+import glob
+import os
+import time
+
+from ConfigVariables import ConfigVariables
+from ConsoleColor import ConsoleColor
+from ReviewPageGenerator import ReviewPageGenerator
+from ReviewParser import available_review_parsers
+
+
+class ParserBenchmark:
+
+    def __init__(self):
+        self.fixturePagesLocation = ConfigVariables.localFixturePagesLocation
+        self.generated_page_amount = 20
+        self.rounds = 3
+
+    def run(self):
+        pages = self.__load_fixture_pages()
+        expected_reviews = None
+
+        print(f"{ConsoleColor.GREEN}Parsing {len(pages)} fixture pages {self.rounds} times per backend{ConsoleColor.END}")
+
+        for review_parser in available_review_parsers():
+            start = time.perf_counter()
+
+            for _ in range(self.rounds):
+                reviews = [review_parser.extract_reviews(page) for page in pages]
+                review_parser.page_amount(pages[0])
+
+            pages_per_second = len(pages) * self.rounds / (time.perf_counter() - start)
+
+            # Every backend must find exactly the same reviews as the first one
+            if expected_reviews is None:
+                expected_reviews = reviews
+            elif reviews != expected_reviews:
+                print(f"{ConsoleColor.RED}{review_parser.name}: reviews differ from the other backends{ConsoleColor.END}")
+
+            print(f"{review_parser.name}: {pages_per_second:.1f} pages/sec")
+
+    def __load_fixture_pages(self) -> list:
+        # Saved review pages can be put into the folder, generated ones are used when it is empty
+        if not glob.glob(os.path.join(self.fixturePagesLocation, "*.html")):
+            self.__save_generated_pages()
+
+        pages = []
+
+        for page_file_path in sorted(glob.glob(os.path.join(self.fixturePagesLocation, "*.html"))):
+            with open(page_file_path, "r", encoding="UTF-8") as page_file:
+                pages.append(page_file.read())
+
+        return pages
+
+    def __save_generated_pages(self):
+        os.makedirs(self.fixturePagesLocation, exist_ok=True)
+        review_page_generator = ReviewPageGenerator(self.generated_page_amount)
+
+        for page in range(self.generated_page_amount):
+            with open(os.path.join(self.fixturePagesLocation, f"page-{page:03}.html"), "w", encoding="UTF-8") as page_file:
+                page_file.write(review_page_generator.generate_page(page))
+
+
+if __name__ == '__main__':
+    ParserBenchmark().run()
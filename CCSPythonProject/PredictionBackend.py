@@ -0,0 +1,136 @@
+import os
+import pickle
+import threading
+import time
+from itertools import islice
+
+from ConfigVariables import ConfigVariables
+from Metrics import metrics
+from PredictionCache import PredictionCache
+from PredictionEngine import PredictionEngine
+from ReviewFile import ReviewFile
+
+
+class PredictionBackend:
+    name = ""
+
+    # Yields (snippet, categories, latency_seconds) in input order
+    def predict_stream(self, snippets):
+        raise NotImplementedError
+
+    def predict_all(self, snippets: list) -> list:
+        return [categories for _, categories, _ in self.predict_stream(snippets)]
+
+    @property
+    def snippets_per_second(self) -> float:
+        raise NotImplementedError
+
+    def summary(self) -> str:
+        return f"Prediction throughput: {self.snippets_per_second:.2f} snippets/sec"
+
+    def close(self):
+        pass
+
+
+class AutoMlPredictionBackend(PredictionBackend):
+    name = "automl"
+
+    def __init__(self, prediction_client, model_full_id: str):
+        self.prediction_cache = PredictionCache(
+            ConfigVariables.predictionCacheFile,
+            ConfigVariables.predictionCacheMaxEntries
+        )
+        self.prediction_engine = PredictionEngine(prediction_client, model_full_id, self.prediction_cache)
+
+    def predict_stream(self, snippets):
+        return self.prediction_engine.predict_stream(snippets)
+
+    @property
+    def snippets_per_second(self) -> float:
+        return self.prediction_engine.snippets_per_second
+
+    def summary(self) -> str:
+        return (
+            f"{super().summary()}\n"
+            f"Prediction cache hits: {self.prediction_cache.hits}, misses: {self.prediction_cache.misses}, "
+            f"duplicates in file: {self.prediction_engine.deduplicated_snippets}"
+        )
+
+    def close(self):
+        self.prediction_cache.close()
+
+
+class LocalPredictionBackend(PredictionBackend):
+    name = "local"
+
+    def __init__(self, model_file_path: str):
+        self.batch_size = ConfigVariables.localPredictionBatchSize
+        # The prediction service classifies several batches at once
+        self.lock = threading.Lock()
+        self.predicted_snippets = 0
+        self.elapsed_seconds = 0.0
+
+        with open(model_file_path, "rb") as model_file:
+            self.vectorizer, self.classifier = pickle.load(model_file)
+
+    @staticmethod
+    def train(dataset_file_path: str, model_file_path: str) -> float:
+        try:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            from sklearn.linear_model import LogisticRegression
+            from sklearn.model_selection import train_test_split
+        except ImportError:
+            raise ImportError("The local prediction backend needs scikit-learn, install it with: pip install scikit-learn")
+
+        rows = [row for row in ReviewFile(dataset_file_path).rows() if len(row) >= 2 and row[0].strip()]
+
+        texts = [row[0] for row in rows]
+        labels = [row[1].strip() for row in rows]
+
+        train_texts, test_texts, train_labels, test_labels = train_test_split(
+            texts, labels, test_size=0.2, random_state=0, stratify=labels
+        )
+
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2), min_df=2, sublinear_tf=True)
+        classifier = LogisticRegression(max_iter=1000)
+        classifier.fit(vectorizer.fit_transform(train_texts), train_labels)
+        accuracy = classifier.score(vectorizer.transform(test_texts), test_labels)
+
+        # The final model is trained on the whole dataset
+        classifier.fit(vectorizer.fit_transform(texts), labels)
+
+        os.makedirs(os.path.dirname(model_file_path), exist_ok=True)
+
+        with open(model_file_path, "wb") as model_file:
+            pickle.dump((vectorizer, classifier), model_file)
+
+        return accuracy
+
+    def predict_stream(self, snippets):
+        snippets = iter(snippets)
+
+        # Every batch is classified with a single matrix multiplication
+        while batch := list(islice(snippets, self.batch_size)):
+            start = time.perf_counter()
+
+            with metrics.timer("predict_local", snippets=len(batch)):
+                scores = self.classifier.predict_proba(self.vectorizer.transform(batch))
+
+            batch_seconds = time.perf_counter() - start
+
+            with self.lock:
+                self.elapsed_seconds += batch_seconds
+                self.predicted_snippets += len(batch)
+
+            for snippet, snippet_scores in zip(batch, scores):
+                categories = dict.fromkeys(ConfigVariables.predictionCategories, 0)
+                categories.update(zip(self.classifier.classes_, snippet_scores.tolist()))
+
+                yield snippet, categories, batch_seconds / len(batch)
+
+    @property
+    def snippets_per_second(self) -> float:
+        if self.elapsed_seconds == 0:
+            return 0.0
+
+        return self.predicted_snippets / self.elapsed_seconds
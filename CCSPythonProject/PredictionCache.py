@@ -0,0 +1,83 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from Metrics import metrics
+
+
+class PredictionCache:
+
+    def __init__(self, cache_file_path: str, max_entries: int):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.connection = sqlite3.connect(cache_file_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            "key TEXT PRIMARY KEY, "
+            "model TEXT NOT NULL, "
+            "scores TEXT NOT NULL, "
+            "last_access INTEGER NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS predictions_last_access ON predictions (last_access)")
+        self.connection.commit()
+
+        self.size = self.connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    @staticmethod
+    def normalize(snippet: str) -> str:
+        # Scraped copies of the same review differ only in unicode form and whitespace
+        return " ".join(unicodedata.normalize("NFC", snippet).split())
+
+    @staticmethod
+    def key(model: str, snippet: str) -> str:
+        content = f"{model}\0{PredictionCache.normalize(snippet)}"
+
+        return hashlib.sha256(content.encode("UTF-8")).hexdigest()
+
+    def get(self, key: str):
+        with self.lock:
+            row = self.connection.execute("SELECT scores FROM predictions WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                self.misses += 1
+                metrics.increment("prediction_cache_misses")
+                return None
+
+            self.hits += 1
+            metrics.increment("prediction_cache_hits")
+            self.connection.execute("UPDATE predictions SET last_access = ? WHERE key = ?", (time.time_ns(), key))
+            self.connection.commit()
+
+            return json.loads(row[0])
+
+    def put(self, key: str, model: str, categories: dict):
+        with self.lock:
+            inserted = self.connection.execute(
+                "INSERT OR IGNORE INTO predictions (key, model, scores, last_access) VALUES (?, ?, ?, ?)",
+                (key, model, json.dumps(categories), time.time_ns())
+            ).rowcount
+            self.size += inserted
+
+            # Least recently used predictions are removed first
+            if self.size > self.max_entries:
+                excess = self.size - self.max_entries
+                self.connection.execute(
+                    "DELETE FROM predictions WHERE key IN "
+                    "(SELECT key FROM predictions ORDER BY last_access LIMIT ?)",
+                    (excess,)
+                )
+                self.size -= excess
+
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,195 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from google.api_core import exceptions
+from google.cloud import automl
+
+from ConfigVariables import ConfigVariables
+from Metrics import metrics
+from PredictionCache import PredictionCache
+
+
+class TokenBucket:
+    # Buckets shared by every engine of the process by name, so concurrent runs stay within one quota
+    shared_buckets = {}
+    shared_lock = threading.Lock()
+
+    def __init__(self, requests_per_minute: int, capacity: int = 1):
+        self.rate = requests_per_minute / 60
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait_seconds = (1 - self.tokens) / self.rate
+
+            time.sleep(wait_seconds)
+
+    @classmethod
+    def shared(cls, name: str, requests_per_minute: int, capacity: int = 1):
+        with cls.shared_lock:
+            key = (name, requests_per_minute, capacity)
+
+            if key not in cls.shared_buckets:
+                cls.shared_buckets[key] = cls(requests_per_minute, capacity)
+
+            return cls.shared_buckets[key]
+
+
+class PredictionEngine:
+    # Errors after which the same request can be sent again
+    retryable_errors = (
+        exceptions.TooManyRequests,
+        exceptions.ResourceExhausted,
+        exceptions.ServiceUnavailable,
+        exceptions.DeadlineExceeded,
+        exceptions.InternalServerError,
+    )
+
+    def __init__(self, prediction_client, model_full_id: str, prediction_cache: PredictionCache = None):
+        self.prediction_client = prediction_client
+        self.model_full_id = model_full_id
+        self.prediction_cache = prediction_cache
+        # The quota belongs to the project, e.g. "projects/<id>/locations/<region>", not to a single prediction run
+        self.rate_limiter = TokenBucket.shared(
+            model_full_id.split("/models/")[0],
+            ConfigVariables.predictionRequestsPerMinute,
+            ConfigVariables.predictionBurstSize
+        )
+        self.workers = ConfigVariables.predictionWorkers
+        self.max_in_flight = ConfigVariables.predictionMaxInFlight
+        self.max_retries = ConfigVariables.predictionMaxRetries
+        self.backoff_seconds = ConfigVariables.predictionBackoffSeconds
+
+        # The prediction service streams several batches through one engine at once
+        self.lock = threading.Lock()
+        self.predicted_snippets = 0
+        self.deduplicated_snippets = 0
+        self.elapsed_seconds = 0.0
+
+    @property
+    def snippets_per_second(self) -> float:
+        if self.elapsed_seconds == 0:
+            return 0.0
+
+        return self.predicted_snippets / self.elapsed_seconds
+
+    def predict_all(self, snippets: list) -> list:
+        return [categories for _, categories, _ in self.predict_stream(snippets)]
+
+    def predict_stream(self, snippets):
+        start = time.perf_counter()
+        in_flight = deque()
+        # Snippets in flight by cache key, so duplicates wait for the same request
+        pending = {}
+
+        # At most max_in_flight snippets are held in memory, the results are yielded in input order
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                for snippet in snippets:
+                    key = PredictionCache.key(self.model_full_id, snippet)
+                    in_flight.append((snippet, key, self.__submit(executor, pending, key, snippet)))
+
+                    if len(in_flight) >= self.max_in_flight:
+                        yield self.__complete(pending, in_flight.popleft())
+
+                while in_flight:
+                    yield self.__complete(pending, in_flight.popleft())
+            finally:
+                for _, _, future in in_flight:
+                    future.cancel()
+
+                with self.lock:
+                    self.elapsed_seconds += time.perf_counter() - start
+
+    def predict_snippet(self, snippet: str) -> dict:
+        text_snippet = automl.TextSnippet(
+            content=snippet,
+            mime_type="text/plain"
+        )
+
+        payload = automl.ExamplePayload(
+            text_snippet=text_snippet
+        )
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+
+            try:
+                with metrics.timer("predict", model=self.model_full_id, attempt=attempt):
+                    response = self.prediction_client.predict(
+                        name=self.model_full_id,
+                        payload=payload
+                    )
+                break
+            except self.retryable_errors:
+                if attempt == self.max_retries:
+                    raise
+
+                metrics.increment("predict_retries")
+
+                # Full jitter keeps the workers from retrying all at once
+                time.sleep(random.uniform(0, self.backoff_seconds * 2 ** attempt))
+
+        categories = dict.fromkeys(ConfigVariables.predictionCategories, 0)
+
+        for annotation_payload in response.payload:
+            categories[annotation_payload.display_name] = annotation_payload.classification.score
+
+        return categories
+
+    def __submit(self, executor: ThreadPoolExecutor, pending: dict, key: str, snippet: str) -> Future:
+        if key in pending:
+            with self.lock:
+                self.deduplicated_snippets += 1
+
+            return pending[key]
+
+        if self.prediction_cache:
+            categories = self.prediction_cache.get(key)
+
+            if categories is not None:
+                future = Future()
+                future.set_result((categories, 0.0))
+                return future
+
+        future = executor.submit(self.__predict_and_cache, key, snippet)
+        pending[key] = future
+
+        return future
+
+    def __predict_and_cache(self, key: str, snippet: str) -> tuple:
+        start = time.perf_counter()
+        categories = self.predict_snippet(snippet)
+        latency_seconds = time.perf_counter() - start
+
+        if self.prediction_cache:
+            self.prediction_cache.put(key, self.model_full_id, categories)
+
+        return categories, latency_seconds
+
+    def __complete(self, pending: dict, in_flight_snippet: tuple) -> tuple:
+        snippet, key, future = in_flight_snippet
+        categories, latency_seconds = future.result()
+
+        with self.lock:
+            self.predicted_snippets += 1
+
+        if pending.get(key) is future:
+            del pending[key]
+
+        return snippet, categories, latency_seconds
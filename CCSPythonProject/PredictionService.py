@@ -0,0 +1,222 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+
+from ConfigVariables import ConfigVariables
+from ConsoleColor import ConsoleColor
+from Metrics import metrics
+from PredictionBackend import PredictionBackend
+from PredictionCache import PredictionCache
+
+
+class MicroBatcher:
+
+    def __init__(self, prediction_backend: PredictionBackend):
+        self.prediction_backend = prediction_backend
+        self.max_batch_size = ConfigVariables.predictionServiceMaxBatchSize
+        self.max_wait_seconds = ConfigVariables.predictionServiceMaxWaitMilliseconds / 1000
+        self.max_concurrent_batches = ConfigVariables.predictionServiceMaxConcurrentBatches
+        self.queue = asyncio.Queue()
+        self.batches = set()
+
+    async def predict(self, snippet: str) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((snippet, future))
+
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrent_batches)
+
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait_seconds
+
+            # The first request waits at most max_wait_seconds for others to join its batch
+            while len(batch) < self.max_batch_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+
+            await semaphore.acquire()
+            task = asyncio.create_task(self.__predict_batch(batch, semaphore))
+            # The loop keeps only weak references to tasks
+            self.batches.add(task)
+            task.add_done_callback(self.batches.discard)
+
+    async def __predict_batch(self, batch: list, semaphore: asyncio.Semaphore):
+        metrics.increment("service_batches")
+        metrics.increment("service_batched_snippets", len(batch))
+
+        try:
+            predictions = await asyncio.to_thread(self.prediction_backend.predict_all, [snippet for snippet, _ in batch])
+
+            for (_, future), categories in zip(batch, predictions):
+                if not future.done():
+                    future.set_result(categories)
+        except Exception as ex:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(ex)
+        finally:
+            semaphore.release()
+
+
+class PredictionService:
+
+    def __init__(self, prediction_backend: PredictionBackend, model_id: str):
+        self.prediction_backend = prediction_backend
+        self.model_id = model_id
+        self.cache_entries = ConfigVariables.predictionServiceCacheEntries
+        self.max_body_bytes = ConfigVariables.predictionServiceMaxBodyBytes
+        self.cache = OrderedDict()
+        self.in_flight = {}
+        self.micro_batcher = None
+
+    def run(self, host: str = None, port: int = None):
+        try:
+            asyncio.run(self.serve(host or ConfigVariables.predictionServiceHost,
+                                   port or ConfigVariables.predictionServicePort))
+        except KeyboardInterrupt:
+            print(f"\n{ConsoleColor.GREEN}Prediction service has been stopped{ConsoleColor.END}")
+        finally:
+            self.prediction_backend.close()
+
+    async def serve(self, host: str, port: int):
+        self.micro_batcher = MicroBatcher(self.prediction_backend)
+        batcher = asyncio.create_task(self.micro_batcher.run())
+        server = await asyncio.start_server(self.__handle_connection, host, port)
+
+        print(f"{ConsoleColor.GREEN}Prediction service of model {self.model_id} is listening on "
+              f"http://{host}:{server.sockets[0].getsockname()[1]}{ConsoleColor.END}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+    async def classify(self, snippets: list) -> list:
+        return await asyncio.gather(*(self.__classify(snippet) for snippet in snippets))
+
+    async def __classify(self, snippet: str) -> dict:
+        key = PredictionCache.key(self.model_id, snippet)
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            metrics.increment("service_cache_hits")
+            return self.__prediction(snippet, self.cache[key])
+
+        # Clients sending the same text at the same time share one prediction
+        if key in self.in_flight:
+            metrics.increment("service_coalesced_requests")
+            return self.__prediction(snippet, await asyncio.shield(self.in_flight[key]))
+
+        prediction = asyncio.ensure_future(self.micro_batcher.predict(snippet))
+        self.in_flight[key] = prediction
+
+        try:
+            categories = await asyncio.shield(prediction)
+        finally:
+            del self.in_flight[key]
+
+        self.cache[key] = categories
+
+        if len(self.cache) > self.cache_entries:
+            self.cache.popitem(last=False)
+
+        return self.__prediction(snippet, categories)
+
+    def __prediction(self, snippet: str, categories: dict) -> dict:
+        return {
+            "text": snippet,
+            "category": max(categories, key=categories.get),
+            "scores": categories
+        }
+
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            # Connections are kept alive, so a client pays the TCP handshake once
+            while request_line := await reader.readline():
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+
+                while (header_line := await reader.readline()).strip():
+                    name, _, value = header_line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                content_length = int(headers.get("content-length", 0))
+
+                if content_length > self.max_body_bytes:
+                    await self.__respond(writer, 413, {"error": "Request body is too large"}, False)
+                    break
+
+                body = await reader.readexactly(content_length)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                start = time.perf_counter()
+                status, response = await self.__route(method, path.split("?")[0], body)
+                metrics.observe("service_request", time.perf_counter() - start)
+
+                await self.__respond(writer, status, response, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def __route(self, method: str, path: str, body: bytes) -> tuple:
+        if method == "GET" and path == "/health":
+            return 200, {
+                "status": "ok",
+                "model": self.model_id,
+                "backend": self.prediction_backend.name,
+                "cached_predictions": len(self.cache)
+            }
+
+        if method == "GET" and path == "/metrics":
+            return 200, metrics.prometheus_text()
+
+        if method != "POST" or path != "/predict":
+            return 404, {"error": f"Unknown endpoint: {method} {path}"}
+
+        try:
+            request = json.loads(body)
+            texts = request["texts"] if "texts" in request else [request["text"]]
+
+            # A string is iterable too, so "texts": "abc" would be classified as three texts
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                raise TypeError
+        except (ValueError, TypeError, KeyError):
+            return 400, {"error": "Expected a JSON object with \"text\" or a \"texts\" list of strings"}
+
+        try:
+            predictions = await self.classify(texts)
+        except Exception as ex:
+            return 502, {"error": str(ex)}
+
+        return 200, {"predictions": predictions} if "texts" in request else predictions[0]
+
+    async def __respond(self, writer: asyncio.StreamWriter, status: int, response, keep_alive: bool):
+        if isinstance(response, str):
+            content_type, content = "text/plain; version=0.0.4", response.encode("UTF-8")
+        else:
+            content_type, content = "application/json", json.dumps(response).encode("UTF-8")
+
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large", 502: "Bad Gateway"}
+        writer.write(
+            f"HTTP/1.1 {status} {reasons[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(content)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + content
+        )
+        await writer.drain()
@@ -0,0 +1,44 @@
+import cProfile
+import pstats
+
+from ConsoleColor import ConsoleColor
+
+
+class Profiler:
+    profilers = ("cprofile", "pyinstrument")
+
+    def __init__(self, profiler: str, output_file_path: str = None):
+        if profiler not in self.profilers:
+            raise ValueError(f"Unknown profiler: {profiler}")
+
+        self.profiler = profiler
+        self.output_file_path = output_file_path or ("profile.html" if profiler == "pyinstrument" else "profile.prof")
+
+    def __enter__(self):
+        if self.profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler as PyinstrumentProfiler
+            except ImportError:
+                raise ImportError("The pyinstrument profiler needs pyinstrument, install it with: pip install pyinstrument")
+
+            self.session = PyinstrumentProfiler()
+            self.session.start()
+        else:
+            self.session = cProfile.Profile()
+            self.session.enable()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.profiler == "pyinstrument":
+            self.session.stop()
+
+            with open(self.output_file_path, "w", encoding="UTF-8") as profile_file:
+                profile_file.write(self.session.output_html())
+        else:
+            self.session.disable()
+            # The file can be opened with snakeviz or pstats
+            self.session.dump_stats(self.output_file_path)
+            pstats.Stats(self.session).sort_stats("cumulative").print_stats(15)
+
+        print(f"{ConsoleColor.GREEN}Profile has been saved{ConsoleColor.END} ({self.output_file_path})")
@@ -0,0 +1,170 @@
+import glob
+import os
+
+from ConfigVariables import ConfigVariables
+
+
+class ResultWriter:
+    name = ""
+
+    def __init__(self, committed_rows: int):
+        self.written_rows = committed_rows
+        self.committed_rows = committed_rows
+
+    def write(self, snippet: str, categories: dict, latency_seconds: float) -> bool:
+        raise NotImplementedError
+
+    def position(self) -> int:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class CsvResultWriter(ResultWriter):
+    name = "csv"
+
+    def __init__(self, output_file_path: str, committed_rows: int = 0, position: int = None):
+        super().__init__(committed_rows)
+        self.commit_interval = ConfigVariables.predictionCheckpointInterval
+
+        # Rows written after the last commit are predicted again
+        if position is not None:
+            os.truncate(output_file_path, position)
+
+        self.output_file = open(output_file_path, "a", encoding="UTF-8")
+
+    def write(self, snippet: str, categories: dict, latency_seconds: float) -> bool:
+        max_value_key = max(categories, key=categories.get)
+        self.output_file.write(f"{snippet.replace(',', '')},{max_value_key}\n")
+        self.written_rows += 1
+
+        if self.written_rows % self.commit_interval != 0:
+            return False
+
+        self.output_file.flush()
+        self.committed_rows = self.written_rows
+
+        return True
+
+    def position(self) -> int:
+        return self.output_file.tell()
+
+    def close(self):
+        self.output_file.close()
+
+
+class ParquetResultWriter(ResultWriter):
+    name = "parquet"
+
+    def __init__(self, run_directory: str, input_file: str, committed_rows: int = 0, position: int = 0):
+        super().__init__(committed_rows)
+        self.pa, self.pq = ResultStore.import_pyarrow()
+        self.run_directory = run_directory
+        self.input_file = input_file
+        self.batch_size = ConfigVariables.resultStoreBatchSize
+        self.parts = position
+        self.categories = ConfigVariables.predictionCategories
+        self.columns = self.__empty_columns()
+
+        # Parts written after the last commit are predicted again
+        for part_file_path in glob.glob(os.path.join(run_directory, "part-*.parquet")):
+            if int(os.path.basename(part_file_path)[5:10]) >= position:
+                os.remove(part_file_path)
+
+    def write(self, snippet: str, categories: dict, latency_seconds: float) -> bool:
+        self.columns["text"].append(snippet)
+        self.columns["category"].append(max(categories, key=categories.get))
+        self.columns["latency_seconds"].append(latency_seconds)
+
+        for category in self.categories:
+            self.columns[f"score_{category}"].append(categories.get(category, 0.0))
+
+        self.written_rows += 1
+
+        if len(self.columns["text"]) < self.batch_size:
+            return False
+
+        self.__write_part()
+
+        return True
+
+    def position(self) -> int:
+        return self.parts
+
+    def close(self):
+        if self.columns["text"]:
+            self.__write_part()
+
+    def __empty_columns(self) -> dict:
+        columns = {"text": [], "category": [], "latency_seconds": []}
+        columns.update((f"score_{category}", []) for category in self.categories)
+
+        return columns
+
+    def __write_part(self):
+        table = self.pa.table(self.columns, schema=ResultStore.schema(self.pa))
+        table = table.append_column(
+            "input_file",
+            self.pa.array([self.input_file] * len(table), self.pa.string()).dictionary_encode()
+        )
+
+        # Every batch becomes a finished file, so a crash never leaves a part without its footer
+        part_file_name = f"part-{self.parts:05d}.parquet"
+        temporary_file_path = os.path.join(self.run_directory, f".{part_file_name}.tmp")
+        self.pq.write_table(table, temporary_file_path)
+        os.replace(temporary_file_path, os.path.join(self.run_directory, part_file_name))
+
+        self.parts += 1
+        self.committed_rows = self.written_rows
+        self.columns = self.__empty_columns()
+
+
+class ResultStore:
+
+    def __init__(self, store_location: str = None):
+        self.store_location = store_location or ConfigVariables.localResultStoreLocation
+
+    @staticmethod
+    def import_pyarrow():
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("The Parquet result store needs pyarrow, install it with: pip install pyarrow")
+
+        return pyarrow, pyarrow.parquet
+
+    @staticmethod
+    def schema(pa):
+        fields = [("text", pa.string()), ("category", pa.string()), ("latency_seconds", pa.float64())]
+        fields += [(f"score_{category}", pa.float64()) for category in ConfigVariables.predictionCategories]
+
+        return pa.schema(fields)
+
+    def run_directory(self, model_id: str, date: str, run_name: str) -> str:
+        # Hive-style directories let readers skip whole models and dates
+        return os.path.join(self.store_location, f"model={model_id}", f"date={date}", f"run={run_name}")
+
+    def scan(self, columns: list, model_id: str = None, date_from: str = None, date_to: str = None, path: str = None):
+        pa, _ = self.import_pyarrow()
+        import pyarrow.dataset as ds
+
+        partitioning = ds.partitioning(
+            pa.schema([("model", pa.string()), ("date", pa.string()), ("run", pa.string())]),
+            flavor="hive"
+        )
+        dataset = ds.dataset(path or self.store_location, format="parquet", partitioning=partitioning)
+
+        predicate = None
+
+        for condition in (
+            ds.field("model") == model_id if model_id else None,
+            ds.field("date") >= date_from if date_from else None,
+            ds.field("date") <= date_to if date_to else None
+        ):
+            if condition is not None:
+                predicate = condition if predicate is None else predicate & condition
+
+        # Only the requested columns of the matching partitions are read, one record batch at a time
+        yield from dataset.to_batches(columns=columns, filter=predicate)
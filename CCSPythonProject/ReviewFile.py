@@ -0,0 +1,66 @@
+import csv
+import io
+import mmap
+import os
+
+from FilePart import FilePart
+
+
+class ReviewFile:
+    # Bytes read from the disk at once
+    buffer_size = 1024 * 1024
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.size = os.path.getsize(file_path)
+
+    def rows(self, start: int = 0, end: int = None):
+        with self.open(start, end) as review_stream:
+            yield from csv.reader(review_stream)
+
+    def open(self, start: int = 0, end: int = None) -> io.TextIOBase:
+        # utf-8-sig drops the BOM, newline="" leaves the line breaks inside quoted reviews to the CSV parser
+        if start == 0 and end is None:
+            return open(self.file_path, "r", encoding="utf-8-sig", newline="")
+
+        # A range has to start and end at row boundaries, as the ones returned by split
+        file_part = FilePart(self.file_path, start, (self.size if end is None else end) - start)
+
+        return io.TextIOWrapper(io.BufferedReader(file_part, self.buffer_size), encoding="utf-8-sig", newline="")
+
+    def split(self, parts: int) -> list:
+        if self.size == 0:
+            return []
+
+        part_size = max(1, self.size // parts)
+        boundaries = [0]
+        position = 0
+        quotes = 0
+
+        # Only the split needs random access, the mapped pages are searched in C
+        with open(self.file_path, "rb") as review_file, \
+                mmap.mmap(review_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for part in range(1, parts):
+                quotes += self.__count_quotes(data, position, max(position, part * part_size))
+                position = max(position, part * part_size)
+
+                # Quotes inside quoted fields are doubled, so a line break ends a row when an even number of quotes
+                # comes before it
+                while (line_end := data.find(b"\n", position)) != -1:
+                    quotes += self.__count_quotes(data, position, line_end)
+                    position = line_end + 1
+
+                    if quotes % 2 == 0:
+                        boundaries.append(position)
+                        break
+
+        boundaries.append(self.size)
+
+        return [(part_start, part_end) for part_start, part_end in zip(boundaries, boundaries[1:]) if part_start < part_end]
+
+    def __count_quotes(self, data: mmap.mmap, start: int, end: int) -> int:
+        # Counted a buffer at a time, so a part is never copied into memory as a whole
+        return sum(
+            data[block_start:min(block_start + self.buffer_size, end)].count(b'"')
+            for block_start in range(start, end, self.buffer_size)
+        )
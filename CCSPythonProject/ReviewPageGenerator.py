@@ -0,0 +1,65 @@
+import html
+import random
+
+
+class ReviewPageGenerator:
+    words = (
+        "movie", "film", "story", "plot", "actor", "actress", "scene", "ending", "character", "marvel",
+        "good", "bad", "boring", "amazing", "awful", "great", "confusing", "funny", "slow", "brilliant",
+        "the", "a", "and", "but", "was", "is", "not", "very", "really", "too", "i", "it", "this", "that"
+    )
+
+    def __init__(self, page_amount: int, reviews_per_page: int = 100, seed: int = 0):
+        self.page_amount = page_amount
+        self.reviews_per_page = reviews_per_page
+        self.seed = seed
+
+    def generate_page(self, page: int) -> str:
+        # The same page number always gives the same page
+        generator = random.Random(self.seed * 1000003 + page)
+        reviews = "\n".join(self.__review(generator) for _ in range(self.reviews_per_page))
+
+        return (
+            "<!DOCTYPE html>\n<html><head><title>User Reviews</title>\n"
+            f"<script>{'var tracking = {};' * 200}</script></head>\n"
+            "<body><div class=\"header_nav\">" + "<a href=\"/\">Menu</a>" * 50 + "</div>\n"
+            f"<div class=\"reviews user_reviews\">\n{reviews}\n</div>\n"
+            f"{self.__pager(page)}\n"
+            "<div class=\"footer\">" + "<p>Terms of use</p>" * 50 + "</div></body></html>\n"
+        )
+
+    def __review(self, generator: random.Random) -> str:
+        text = html.escape(" ".join(generator.choice(self.words) for _ in range(generator.randint(10, 120))))
+        grade = generator.randint(0, 10)
+
+        # Long reviews are collapsed on the page, short ones have a single span
+        if len(text) > 300:
+            body = (
+                f"<span class=\"blurb blurb_collapsed\">{text[:300]}</span>"
+                f"<span class=\"blurb blurb_expanded\">{text}</span>"
+            )
+        else:
+            body = f"<span>{text}</span>"
+
+        return (
+            "<div class=\"review pad_top1\"><div class=\"review_content\">"
+            "<div class=\"review_section\"><div class=\"review_stats\">"
+            f"<div class=\"name\"><a href=\"/user/u{generator.randint(0, 99999)}\">user</a></div>"
+            f"<div class=\"date\">Nov 10, 2022</div><div class=\"review_grade\"><div class=\"metascore_w\">{grade}</div>"
+            "</div></div></div>"
+            f"<div class=\"review_section\"><div class=\"review_body\">{body}</div></div>"
+            "</div></div>"
+        )
+
+    def __pager(self, page: int) -> str:
+        if page == self.page_amount - 1:
+            last_page = f"<span class=\"page_num\">{self.page_amount}</span>"
+        else:
+            last_page = f"<a class=\"page_num\" href=\"?page={self.page_amount - 1}\">{self.page_amount}</a>"
+
+        return (
+            "<div class=\"page_nav\"><div class=\"pages\"><ul class=\"pages\">"
+            f"<li class=\"page first_page\"><span class=\"page_num\">1</span></li>"
+            f"<li class=\"page last_page\">{last_page}</li>"
+            "</ul></div></div>"
+        )
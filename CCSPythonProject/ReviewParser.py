@@ -0,0 +1,159 @@
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+class ReviewParser:
+    name = ""
+
+    def extract_reviews(self, page: str) -> list:
+        raise NotImplementedError
+
+    def page_amount(self, page: str) -> int:
+        raise NotImplementedError
+
+
+class HtmlReviewParser(ReviewParser):
+    name = "html.parser"
+
+    def extract_reviews(self, page: str) -> list:
+        return self._extract_reviews(BeautifulSoup(page, 'html.parser'))
+
+    def page_amount(self, page: str) -> int:
+        return self._page_amount(BeautifulSoup(page, 'html.parser'))
+
+    def _extract_reviews(self, soup: BeautifulSoup) -> list:
+        reviews = []
+
+        for review in soup.find_all('div', class_='review pad_top1'):
+            if review.find('span', class_='blurb blurb_expanded'):
+                reviews.append(review.find('span', class_='blurb blurb_expanded').text)
+            else:
+                reviews.append(review.find('div', class_='review_body').find('span').text)
+
+        return reviews
+
+    def _page_amount(self, soup: BeautifulSoup) -> int:
+        page_amount = 1
+
+        for pages in soup.find_all('div', class_='pages'):
+            last_page = pages.find('li', class_='page last_page')
+
+            if last_page and last_page.find('a') and last_page.find('a').text:
+                page_amount = int(last_page.find('a').text)
+            else:
+                page_amount = 1
+
+        return page_amount
+
+
+class StrainedReviewParser(HtmlReviewParser):
+    name = "soupstrainer"
+
+    # Only the review and pager elements are turned into a tree, the rest of the page is skipped
+    reviews_strainer = SoupStrainer('div', class_='review pad_top1')
+    pages_strainer = SoupStrainer('div', class_='pages')
+
+    def extract_reviews(self, page: str) -> list:
+        return self._extract_reviews(BeautifulSoup(page, 'html.parser', parse_only=self.reviews_strainer))
+
+    def page_amount(self, page: str) -> int:
+        return self._page_amount(BeautifulSoup(page, 'html.parser', parse_only=self.pages_strainer))
+
+
+class LxmlReviewParser(ReviewParser):
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+
+        self.lxml_html = lxml.html
+
+    def extract_reviews(self, page: str) -> list:
+        reviews = []
+
+        for review in self.lxml_html.fromstring(page).xpath("//div[@class='review pad_top1']"):
+            blurb = review.xpath(".//span[@class='blurb blurb_expanded']")
+
+            if blurb:
+                reviews.append(blurb[0].text_content())
+            else:
+                reviews.append(review.xpath(".//div[@class='review_body']//span")[0].text_content())
+
+        return reviews
+
+    def page_amount(self, page: str) -> int:
+        page_amount = 1
+
+        for pages in self.lxml_html.fromstring(page).xpath("//div[@class='pages']"):
+            last_page = pages.xpath(".//li[@class='page last_page']//a")
+
+            if last_page and last_page[0].text_content():
+                page_amount = int(last_page[0].text_content())
+            else:
+                page_amount = 1
+
+        return page_amount
+
+
+class SelectolaxReviewParser(ReviewParser):
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+
+        self.html_parser = LexborHTMLParser
+
+    def extract_reviews(self, page: str) -> list:
+        reviews = []
+
+        for review in self.html_parser(page).css('div[class="review pad_top1"]'):
+            blurb = review.css_first('span[class="blurb blurb_expanded"]')
+
+            if blurb:
+                reviews.append(blurb.text())
+            else:
+                reviews.append(review.css_first('div[class="review_body"] span').text())
+
+        return reviews
+
+    def page_amount(self, page: str) -> int:
+        page_amount = 1
+
+        for pages in self.html_parser(page).css('div[class="pages"]'):
+            last_page = pages.css_first('li[class="page last_page"] a')
+
+            if last_page and last_page.text():
+                page_amount = int(last_page.text())
+            else:
+                page_amount = 1
+
+        return page_amount
+
+
+# Backends from the fastest to the slowest, the optional ones are skipped when not installed
+review_parsers = (SelectolaxReviewParser, LxmlReviewParser, StrainedReviewParser, HtmlReviewParser)
+
+
+def available_review_parsers() -> list:
+    parsers = []
+
+    for review_parser in review_parsers:
+        try:
+            parsers.append(review_parser())
+        except ImportError:
+            pass
+
+    return parsers
+
+
+def create_review_parser(name: str = None) -> ReviewParser:
+    for review_parser in review_parsers:
+        if name and review_parser.name != name:
+            continue
+
+        try:
+            return review_parser()
+        except ImportError:
+            if name:
+                raise
+
+    raise ValueError(f"Unknown review parser: {name}")
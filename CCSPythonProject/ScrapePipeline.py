@@ -0,0 +1,131 @@
+import csv
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ConfigVariables import ConfigVariables
+from Metrics import metrics
+from PageFetcher import PageFetcher
+from ReviewParser import create_review_parser
+
+# Review parser of a parser worker process, created on its first page
+worker_review_parser = None
+
+
+def parse_reviews(parser_name: str, page: str) -> tuple:
+    global worker_review_parser
+
+    if worker_review_parser is None:
+        worker_review_parser = create_review_parser(parser_name)
+
+    # Metrics of a worker process are lost, so the parse time is sent back with the reviews
+    start = time.perf_counter()
+    reviews = worker_review_parser.extract_reviews(page)
+
+    return reviews, time.perf_counter() - start
+
+
+class ScrapePipeline:
+    # Marks the end of the fetched pages in the page queue
+    end_of_pages = None
+
+    def __init__(self, page_fetcher: PageFetcher, parser_name: str):
+        self.page_fetcher = page_fetcher
+        self.parser_name = parser_name
+        self.parser_workers = ConfigVariables.scraperParserWorkers
+        self.queue_size = ConfigVariables.scraperPipelineQueueSize
+        self.process_start_method = ConfigVariables.processStartMethod
+
+    def run(self, first_page: str, page_urls: list, output_file_path: str) -> int:
+        page_queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+
+        fetcher = threading.Thread(target=self.__fetch_pages, args=(page_urls, page_queue, stop), daemon=True)
+        fetcher.start()
+
+        number_of_reviews = 0
+        parsed_pages = deque()
+
+        try:
+            # The fetcher thread is already running, so the workers are not forked from this process
+            with ProcessPoolExecutor(max_workers=self.parser_workers,
+                                     mp_context=multiprocessing.get_context(self.process_start_method)) as parser_pool, \
+                    open(output_file_path, "w", encoding="utf-8", newline="") as output_file:
+                writer = csv.writer(output_file, lineterminator="\n")
+                writer.writerow(["Review"])
+
+                parsed_pages.append(parser_pool.submit(parse_reviews, self.parser_name, first_page))
+
+                while True:
+                    page = page_queue.get()
+
+                    if page is self.end_of_pages:
+                        break
+
+                    if isinstance(page, Exception):
+                        raise page
+
+                    parsed_pages.append(parser_pool.submit(parse_reviews, self.parser_name, page))
+
+                    # Pages are written in their original order as soon as the oldest one is parsed
+                    if len(parsed_pages) >= self.parser_workers * 2:
+                        number_of_reviews += self.__write_reviews(writer, parsed_pages.popleft().result())
+
+                while parsed_pages:
+                    number_of_reviews += self.__write_reviews(writer, parsed_pages.popleft().result())
+        finally:
+            stop.set()
+
+            for parsed_page in parsed_pages:
+                parsed_page.cancel()
+
+            fetcher.join()
+
+        return number_of_reviews
+
+    def __fetch_pages(self, page_urls: list, page_queue: queue.Queue, stop: threading.Event):
+        in_flight = deque()
+
+        with ThreadPoolExecutor(max_workers=self.page_fetcher.workers) as executor:
+            try:
+                for page_url in page_urls:
+                    in_flight.append(executor.submit(self.page_fetcher.fetch, page_url))
+
+                    if len(in_flight) >= self.page_fetcher.workers:
+                        if not self.__put(page_queue, in_flight.popleft().result().text, stop):
+                            return
+
+                while in_flight:
+                    if not self.__put(page_queue, in_flight.popleft().result().text, stop):
+                        return
+            except Exception as ex:
+                self.__put(page_queue, ex, stop)
+                return
+            finally:
+                for page in in_flight:
+                    page.cancel()
+
+        self.__put(page_queue, self.end_of_pages, stop)
+
+    def __put(self, page_queue: queue.Queue, item, stop: threading.Event) -> bool:
+        # The writer may stop early, so the fetcher must not wait forever on a full queue
+        while not stop.is_set():
+            try:
+                page_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def __write_reviews(self, writer, parsed_page: tuple) -> int:
+        reviews, parse_seconds = parsed_page
+        metrics.observe("parse", parse_seconds)
+
+        for review in reviews:
+            writer.writerow([review])
+
+        return len(reviews)
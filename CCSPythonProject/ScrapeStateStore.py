@@ -0,0 +1,33 @@
+import json
+import os
+
+
+class ScrapeStateStore:
+
+    def __init__(self, state_file_path: str):
+        self.state_file_path = state_file_path
+        self.states = {}
+
+        if os.path.exists(state_file_path):
+            with open(state_file_path, "r", encoding="UTF-8") as state_file:
+                self.states = json.load(state_file)
+
+    def get(self, url: str):
+        return self.states.get(url)
+
+    def update(self, url: str, etag: str, last_modified: str, page_count: int, last_review_hash: str):
+        self.states[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "page_count": page_count,
+            "last_review_hash": last_review_hash
+        }
+
+    def save(self):
+        # The state file is replaced atomically so an interrupted batch never corrupts it
+        temporary_file_path = self.state_file_path + ".tmp"
+
+        with open(temporary_file_path, "w", encoding="UTF-8") as state_file:
+            json.dump(self.states, state_file, indent=2)
+
+        os.replace(temporary_file_path, self.state_file_path)
@@ -0,0 +1,33 @@
+from functools import cache
+
+
+# The modules below import google-cloud, bs4, pandas and matplotlib,
+# so they are only loaded when their first action is chosen
+@cache
+def natural_language_api():
+    from NaturalLanguageAPI import NaturalLanguageAPI
+    return NaturalLanguageAPI()
+
+
+@cache
+def storage_api():
+    from StorageAPI import StorageAPI
+    return StorageAPI()
+
+
+@cache
+def web_scraper():
+    from WebScraper import WebScraper
+    return WebScraper()
+
+
+@cache
+def graph_creator():
+    from GraphCreator import GraphCreator
+    return GraphCreator()
+
+
+@cache
+def dataset_preparer():
+    from DatasetPreparer import DatasetPreparer
+    return DatasetPreparer()
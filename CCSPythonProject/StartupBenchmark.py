@@ -0,0 +1,44 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from ConsoleColor import ConsoleColor
+
+
+class StartupBenchmark:
+
+    def __init__(self):
+        self.projectDirectory = os.path.dirname(os.path.abspath(__file__))
+        self.rounds = 5
+        self.scenarios = (
+            # What main.py imports before it shows the first menu
+            ("menu", "import main; main.Menu().display()"),
+            # What main.py imported before the API modules were loaded on first use
+            ("all modules", "import main, NaturalLanguageAPI, StorageAPI, WebScraper, GraphCreator; main.Menu().display()"),
+        )
+
+    def run(self):
+        print(f"{ConsoleColor.GREEN}Median time to the first menu over {self.rounds} fresh interpreters{ConsoleColor.END}")
+
+        for name, code in self.scenarios:
+            timings = [self.__measure(code) for _ in range(self.rounds)]
+
+            print(f"{name}: {statistics.median(timings) * 1000:.0f} ms")
+
+    def __measure(self, code: str) -> float:
+        start = time.perf_counter()
+
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=self.projectDirectory,
+            stdout=subprocess.DEVNULL,
+            check=True
+        )
+
+        return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    StartupBenchmark().run()
@@ -1,52 +1,188 @@
+import json
+import math
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ClientRegistry import ClientRegistry
 from ConfigVariables import ConfigVariables
 from ConsoleColor import ConsoleColor
-from google.cloud import storage
+from FilePart import FilePart
+from google.cloud.storage.retry import DEFAULT_RETRY
+from ListingCache import listing_cache
+from Metrics import metrics
+from UploadIndex import UploadIndex
 
 
 class StorageAPI:
 
-    def __init__(self):
+    def __init__(self, client=None):
         self.csvFilesDirectory = ConfigVariables.localDatasetCsvFilesLocation
-        self.client = storage.Client()
+        # STORAGE_EMULATOR_HOST makes the default client use a local emulator
+        self.client = client or ClientRegistry.storage_client()
         self.bucket = self.client.bucket(ConfigVariables.googleCloudBucketName)
         self.blob_extension = ConfigVariables.blobExtension
-
+        self.chunk_size = ConfigVariables.storageChunkSize
+        self.composite_upload_threshold = ConfigVariables.storageCompositeUploadThreshold
+        self.composite_max_parts = ConfigVariables.storageCompositeMaxParts
+        self.upload_workers = ConfigVariables.storageUploadWorkers
+        self.listing_page_size = ConfigVariables.storageListingPageSize
+        self.upload_index = UploadIndex(ConfigVariables.uploadIndexFile, self.chunk_size)
+        self.bytes_saved = 0
+        self.bytes_saved_lock = threading.Lock()
+
+    @metrics.timer("create_blob")
     def create_blob(self, blob_name: str, file_name: str):
         full_file_name = f"{file_name}{self.blob_extension}"
         full_blob_name = f"{blob_name}{self.blob_extension}"
 
-        bucket = self.client.bucket(self.bucket.name)
-        blob = bucket.blob(full_blob_name)
-
-        file_lines = []
-
-        with open(os.path.join(self.csvFilesDirectory, full_file_name), "r", encoding="utf8") as f:
-            file_lines.append(f.read())
-
-        with blob.open("w", encoding="utf8") as f:
-            for line in file_lines:
-                f.write(line)
-
-        print(f"\n{ConsoleColor.GREEN}Blob created successfully{ConsoleColor.END}")
-
-    def list_blobs(self):
-        blobs = self.client.list_blobs(self.bucket.name)
-
-        number_of_blobs: int = 0
+        bytes_saved_before = self.bytes_saved
+        uploaded = self.__upload_file(os.path.join(self.csvFilesDirectory, full_file_name), full_blob_name)
+        self.upload_index.save()
+        listing_cache.invalidate("blobs")
+
+        if uploaded:
+            print(f"\n{ConsoleColor.GREEN}Blob created successfully{ConsoleColor.END}")
+        else:
+            print(f"\n{ConsoleColor.GREEN}Blob is already up to date, the upload has been skipped{ConsoleColor.END}")
+            print(f"{ConsoleColor.GREEN}Bytes saved: {self.bytes_saved - bytes_saved_before}{ConsoleColor.END}")
+
+    @metrics.timer("create_blobs")
+    def create_blobs(self, directory: str, blob_prefix: str, remove_stale: bool = False):
+        bytes_saved_before = self.bytes_saved
+        file_paths = []
+
+        for root, _, file_names in os.walk(directory):
+            for file_name in sorted(file_names):
+                if file_name.endswith(self.blob_extension):
+                    file_paths.append(os.path.join(root, file_name))
+
+        blob_names = [
+            blob_prefix + os.path.relpath(file_path, directory).replace(os.sep, "/")
+            for file_path in file_paths
+        ]
+
+        # Blobs under the prefix that have no local file any more are deleted, unchanged ones are still skipped
+        if remove_stale:
+            blobs = self.client.list_blobs(self.bucket.name, prefix=blob_prefix, fields="items(name),nextPageToken")
+            stale_blobs = [blob for blob in blobs if blob.name not in blob_names]
+            self.bucket.delete_blobs(stale_blobs, on_error=lambda blob: None)
+            listing_cache.invalidate("blobs")
+
+            print(f"\n{ConsoleColor.GREEN}Number of removed stale blobs: {len(stale_blobs)}{ConsoleColor.END}")
+
+        with ThreadPoolExecutor(max_workers=self.upload_workers) as executor:
+            uploads = [
+                executor.submit(self.__upload_file, file_path, blob_name)
+                for file_path, blob_name in zip(file_paths, blob_names)
+            ]
+
+        listing_cache.invalidate("blobs")
+        number_of_created_blobs = sum(upload.result() for upload in uploads)
+        self.upload_index.save()
+
+        print(f"\n{ConsoleColor.GREEN}Number of created blobs: {number_of_created_blobs}{ConsoleColor.END}")
+        print(f"{ConsoleColor.GREEN}Number of unchanged files: {len(file_paths) - number_of_created_blobs}, "
+              f"bytes saved: {self.bytes_saved - bytes_saved_before}{ConsoleColor.END}")
+
+    def list_blobs(self, prefix: str = "", page_size: int = None, output_json: bool = False) -> list:
+        blobs = listing_cache.get_or_load(
+            ("blobs", self.bucket.name, prefix),
+            lambda: self.__load_blobs(prefix, page_size or self.listing_page_size)
+        )
+
+        if output_json:
+            print(json.dumps(blobs, indent=2))
+            return blobs
 
         print()
 
         for blob in blobs:
-            print(blob.name)
+            print(blob["name"])
 
-            number_of_blobs += 1
+        print(f"{ConsoleColor.GREEN}Number of displayed blobs: {len(blobs)}{ConsoleColor.END}\n")
 
-        print(f"{ConsoleColor.GREEN}Number of displayed blobs: {number_of_blobs}{ConsoleColor.END}\n")
+        return blobs
 
     def remove_blob(self, blob_name: str):
-        bucket = self.client.bucket(self.bucket.name)
-        blob = bucket.blob(f"{blob_name}{self.blob_extension}")
+        blob = self.bucket.blob(f"{blob_name}{self.blob_extension}")
         blob.delete()
+        listing_cache.invalidate("blobs")
 
         print(f"\n{ConsoleColor.GREEN}Blob deleted successfully{ConsoleColor.END}\n")
+
+    @metrics.timer("list_blobs")
+    def __load_blobs(self, prefix: str, page_size: int) -> list:
+        # Only the listed fields are sent back by the server
+        blobs = self.client.list_blobs(
+            self.bucket.name,
+            prefix=prefix or None,
+            page_size=page_size,
+            fields="items(name,size,updated),nextPageToken"
+        )
+
+        return [
+            {
+                "name": blob.name,
+                "size": blob.size,
+                "updated": str(blob.updated) if blob.updated else None
+            }
+            for blob in blobs
+        ]
+
+    def __upload_file(self, file_path: str, blob_name: str) -> bool:
+        file_size = os.path.getsize(file_path)
+        existing_blob = self.bucket.get_blob(blob_name)
+
+        # Composite blobs have no md5 hash, so the files are compared by crc32c
+        if existing_blob and existing_blob.size == file_size \
+                and existing_blob.crc32c == self.upload_index.crc32c(file_path):
+            with self.bytes_saved_lock:
+                self.bytes_saved += file_size
+
+            metrics.increment("upload_skipped_bytes", file_size)
+
+            return False
+
+        if file_size > self.composite_upload_threshold:
+            self.__upload_composite(file_path, blob_name, file_size)
+        else:
+            self.__upload_part(file_path, blob_name, 0, file_size)
+
+        return True
+
+    def __upload_composite(self, file_path: str, blob_name: str, file_size: int):
+        # Parts are whole chunks, every part larger than 8 MiB is a resumable upload of its own
+        number_of_chunks = math.ceil(file_size / self.chunk_size)
+        part_size = math.ceil(number_of_chunks / self.composite_max_parts) * self.chunk_size
+        offsets = range(0, file_size, part_size)
+        part_names = [f"{blob_name}.part-{index:02}" for index in range(len(offsets))]
+
+        with ThreadPoolExecutor(max_workers=self.upload_workers) as executor:
+            uploads = [
+                executor.submit(self.__upload_part, file_path, part_name, offset, min(part_size, file_size - offset))
+                for part_name, offset in zip(part_names, offsets)
+            ]
+
+        parts = [self.bucket.blob(part_name) for part_name in part_names]
+
+        try:
+            for upload in uploads:
+                upload.result()
+
+            blob = self.bucket.blob(blob_name)
+            blob.content_type = "text/csv"
+            with metrics.timer("compose", blob=blob_name, parts=len(parts)):
+                blob.compose(parts, retry=DEFAULT_RETRY)
+        finally:
+            # Parts of a failed upload may not exist, so missing ones are ignored
+            self.bucket.delete_blobs(parts, on_error=lambda part: None)
+
+    def __upload_part(self, file_path: str, blob_name: str, offset: int, size: int):
+        # Uploads larger than 8 MiB are sent in resumable chunks, a dropped connection only repeats the last chunk
+        blob = self.bucket.blob(blob_name, chunk_size=self.chunk_size)
+
+        # Resumable uploads need a stream at position 0, so the part is read like a file of its own
+        with FilePart(file_path, offset, size) as file_part, metrics.timer("upload", blob=blob_name, size=size):
+            blob.upload_from_file(file_part, size=size, content_type="text/csv", retry=DEFAULT_RETRY)
+
+        metrics.increment("uploaded_bytes", size)
@@ -0,0 +1,57 @@
+import base64
+import json
+import os
+import threading
+
+import google_crc32c
+
+
+class UploadIndex:
+
+    def __init__(self, index_file_path: str, read_size: int):
+        self.index_file_path = index_file_path
+        self.read_size = read_size
+        self.lock = threading.Lock()
+        self.entries = {}
+
+        if os.path.exists(index_file_path):
+            with open(index_file_path, "r", encoding="UTF-8") as index_file:
+                self.entries = json.load(index_file)
+
+    def crc32c(self, file_path: str) -> str:
+        key = os.path.abspath(file_path)
+        file_stat = os.stat(file_path)
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+        # The checksum is only computed again when the file was changed since the last time
+        if entry and entry["size"] == file_stat.st_size and entry["mtime"] == file_stat.st_mtime_ns:
+            return entry["crc32c"]
+
+        checksum = google_crc32c.Checksum()
+
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.read_size), b""):
+                checksum.update(chunk)
+
+        # Blobs store the checksum as base64 of its big-endian bytes
+        crc32c = base64.b64encode(checksum.digest()).decode("UTF-8")
+
+        with self.lock:
+            self.entries[key] = {
+                "size": file_stat.st_size,
+                "mtime": file_stat.st_mtime_ns,
+                "crc32c": crc32c
+            }
+
+        return crc32c
+
+    def save(self):
+        with self.lock:
+            temporary_file_path = self.index_file_path + ".tmp"
+
+            with open(temporary_file_path, "w", encoding="UTF-8") as index_file:
+                json.dump(self.entries, index_file, indent=2)
+
+            os.replace(temporary_file_path, self.index_file_path)
@@ -1,53 +1,151 @@
+import csv
+import hashlib
 import os
 from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 from ConfigVariables import ConfigVariables
 from ConsoleColor import ConsoleColor
+from Metrics import metrics
+from PageFetcher import PageFetcher
+from ReviewParser import create_review_parser
+from ScrapePipeline import ScrapePipeline
+from ScrapeStateStore import ScrapeStateStore
 
 
 class WebScraper:
 
     def __init__(self):
-        self.review_dict = {'Review': []}
         self.user_agent = {'User-agent': 'Chrome/39.0.2171.95'}
         self.predictionCsvFilesLocation = ConfigVariables.localPredictionCsvFilesLocation
         self.blobExtension = ConfigVariables.blobExtension
+        self.scrapeStateFile = ConfigVariables.scrapeStateFile
+        self.page_fetcher = PageFetcher(self.user_agent)
+        self.review_parser = create_review_parser(ConfigVariables.scraperParserBackend)
+        self.scrape_pipeline = ScrapePipeline(self.page_fetcher, ConfigVariables.scraperParserBackend)
 
-    def web_scrape(self, input_url: str):
+    @metrics.timer("web_scrape")
+    def web_scrape(self, input_url: str, output_name: str = None) -> str:
         url = input_url + '/user-reviews'
-        page_amount = 1
 
-        response = requests.get(url, headers=self.user_agent)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        first_page = self.page_fetcher.fetch(url).text
+        page_amount = self.review_parser.page_amount(first_page)
 
         print(f"{ConsoleColor.GREEN}Web scraping in progress...{ConsoleColor.END}")
 
-        for review in soup.find_all('div', class_='pages'):
-            if review.find('li', class_='page last_page').find('a').text:
-                page_amount = int(review.find('li', class_='page last_page').find('a').text)
-            else:
-                page_amount = 1
+        # The first page is the same as '?page=0', so it is not downloaded twice
+        page_urls = [url + '?page=' + str(page) for page in range(1, page_amount)]
+        output_file_path = self.__output_file_path(output_name or f"{self.__film_name(input_url)}-reviews")
+        number_of_reviews = self.scrape_pipeline.run(first_page, page_urls, output_file_path)
 
-        for page in range(0, page_amount):
+        print(f"{ConsoleColor.GREEN}Web scraping has been finished successfully{ConsoleColor.END} "
+              f"({number_of_reviews} reviews)")
 
-            url2 = url + '?page=' + str(page)
-            user_agent = {'User-agent': 'Chrome/39.0.2171.95'}
-            response = requests.get(url2, headers=user_agent)
+        # The name without the extension is what apply_model_prediction expects
+        return os.path.basename(output_file_path)[:-len(self.blobExtension)]
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+    @metrics.timer("batch_scrape")
+    def batch_scrape(self, input_urls: list) -> list:
+        scrape_state = ScrapeStateStore(self.scrapeStateFile)
+        output_names = []
 
-            for review in soup.find_all('div', class_='review pad_top1'):
-                if review.find('span', class_='blurb blurb_expanded'):
-                    self.review_dict['Review'].append(review.find('span', class_='blurb blurb_expanded').text)
-                else:
-                    self.review_dict['Review'].append(review.find('div', class_='review_body').find('span').text)
+        print(f"{ConsoleColor.GREEN}Web scraping of {len(input_urls)} films in progress...{ConsoleColor.END}")
 
-        now = datetime.now()
-        output_file_name = now.strftime("%Y-%m-%d") + "-" + now.strftime("%H-%M-%S") + "-" + "reviews" + self.blobExtension
+        for input_url in input_urls:
+            reviews = self.__scrape_new_reviews(input_url, scrape_state)
+
+            if reviews:
+                output_names.append(self.__save_reviews(reviews, f"{self.__film_name(input_url)}-reviews"))
 
-        reviews = pd.DataFrame(self.review_dict)
-        reviews.to_csv(os.path.join(self.predictionCsvFilesLocation, output_file_name), index=False, encoding='utf-8')
+            # The state is saved after every film, so an interrupted batch keeps its progress
+            scrape_state.save()
+
+            print(f"{input_url}: {len(reviews)} new reviews")
 
         print(f"{ConsoleColor.GREEN}Web scraping has been finished successfully{ConsoleColor.END}")
+
+        return output_names
+
+    def __scrape_new_reviews(self, input_url: str, scrape_state: ScrapeStateStore) -> list:
+        url = input_url + '/user-reviews'
+        state = scrape_state.get(url)
+        conditional_headers = {}
+
+        if state and state['etag']:
+            conditional_headers['If-None-Match'] = state['etag']
+
+        if state and state['last_modified']:
+            conditional_headers['If-Modified-Since'] = state['last_modified']
+
+        response = self.page_fetcher.fetch(url, conditional_headers)
+
+        if response.status_code == 304:
+            return []
+
+        first_page = response.text
+        page_amount = self.review_parser.page_amount(first_page)
+
+        with metrics.timer("parse"):
+            first_page_reviews = self.review_parser.extract_reviews(first_page)
+
+        # Reviews are listed newest first, so the first review is the last one seen by the previous run
+        last_review_hash = self.__review_hash(first_page_reviews[0]) if first_page_reviews else None
+        previous_review_hash = state['last_review_hash'] if state else None
+
+        scrape_state.update(
+            url,
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            page_amount,
+            last_review_hash
+        )
+
+        if last_review_hash == previous_review_hash:
+            return []
+
+        # New reviews push the old ones back, so only the pages added since the previous run are fetched first
+        next_page_amount = max(page_amount - state['page_count'] + 1, 2) if state else page_amount
+        pages_reviews = [first_page_reviews]
+        next_page = 1
+        reviews = []
+
+        while pages_reviews:
+            for page_reviews in pages_reviews:
+                for review in page_reviews:
+                    if self.__review_hash(review) == previous_review_hash:
+                        return reviews
+
+                    reviews.append(review)
+
+            page_urls = [url + '?page=' + str(page) for page in range(next_page, min(next_page_amount, page_amount))]
+            pages_reviews = []
+
+            for page in self.page_fetcher.fetch_all(page_urls):
+                with metrics.timer("parse"):
+                    pages_reviews.append(self.review_parser.extract_reviews(page))
+
+            next_page += len(page_urls)
+            next_page_amount = next_page + self.page_fetcher.workers
+
+        return reviews
+
+    def __film_name(self, input_url: str) -> str:
+        # The last part of a film's URL is its name, e.g. "captain-marvel"
+        return input_url.rstrip('/').split('/')[-1]
+
+    def __review_hash(self, review: str) -> str:
+        return hashlib.sha256(review.strip().encode('utf-8')).hexdigest()
+
+    def __save_reviews(self, reviews: list, name: str) -> str:
+        output_file_path = self.__output_file_path(name)
+
+        with open(output_file_path, "w", encoding="utf-8", newline="") as output_file:
+            writer = csv.writer(output_file, lineterminator="\n")
+            writer.writerow(["Review"])
+            writer.writerows([review] for review in reviews)
+
+        return os.path.basename(output_file_path)[:-len(self.blobExtension)]
+
+    def __output_file_path(self, name: str) -> str:
+        now = datetime.now()
+        output_file_name = now.strftime("%Y-%m-%d") + "-" + now.strftime("%H-%M-%S") + "-" + name + self.blobExtension
+
+        return os.path.join(self.predictionCsvFilesLocation, output_file_name)
@@ -1,22 +1,22 @@
+import sys
+
+from Cli import Cli
 from ConsoleColor import ConsoleColor
-from GraphCreator import GraphCreator
 from Menu import Menu
-from NaturalLanguageAPI import NaturalLanguageAPI
-from StorageAPI import StorageAPI
-from WebScraper import WebScraper
+from Services import dataset_preparer, graph_creator, natural_language_api, storage_api, web_scraper
 
 if __name__ == '__main__':
+    # With arguments the program runs a single command without the menu
+    if len(sys.argv) > 1:
+        sys.exit(Cli().run(sys.argv[1:]))
+
+    menu: Menu = Menu()
+
     while True:
         try:
             dataset_name: str
             input_value: int
 
-            menu: Menu = Menu()
-            naturalLanguageAPI = NaturalLanguageAPI()
-            storageAPI = StorageAPI()
-            webScraper = WebScraper()
-            graphCreator = GraphCreator()
-
             menu.display()
 
             try:
@@ -25,76 +25,111 @@ if __name__ == '__main__':
                 input_value = -1
 
             if input_value == 1:
-                webScraper.web_scrape(
+                web_scraper().web_scrape(
                     input("Enter the film's URL on Metacritic: ")
                 )
 
             elif input_value == 2:
-                storageAPI.create_blob(
+                storage_api().create_blob(
                     input("Enter the new blob's name: "),
                     input("Enter the existing file's name: ")
                 )
 
             elif input_value == 3:
-                storageAPI.list_blobs()
+                storage_api().list_blobs()
 
             elif input_value == 4:
-                storageAPI.remove_blob(
+                storage_api().remove_blob(
                     input(f"Enter blob's name: ")
                 )
 
             elif input_value == 5:
-                naturalLanguageAPI.create_and_fill_dataset(
+                natural_language_api().create_and_fill_dataset(
                     input(f"Enter the new dataset's display name: "),
                     input("Enter the existing blob's name: ")
                 )
 
             elif input_value == 6:
-                naturalLanguageAPI.display_datasets()
+                natural_language_api().display_datasets()
 
             elif input_value == 7:
-                naturalLanguageAPI.remove_dataset(
+                natural_language_api().remove_dataset(
                     input(f"Enter id: ")
                 )
 
             elif input_value == 8:
-                naturalLanguageAPI.create_and_train_model(
+                natural_language_api().create_and_train_model(
                     input(f"Enter model's name: "),
                     input(f"Enter dataset's id: ")
                 )
 
             elif input_value == 9:
-                naturalLanguageAPI.evaluate_model(
+                natural_language_api().evaluate_model(
                     input(f"Enter model's id: ")
                 )
 
             elif input_value == 10:
-                naturalLanguageAPI.deploy_model(
+                natural_language_api().deploy_model(
                     input(f"Enter model's id: "),
                 )
 
             elif input_value == 11:
-                output_file_path = naturalLanguageAPI.apply_model_prediction(
+                output_file_path = natural_language_api().apply_model_prediction(
                     input(f"Enter model's id: "),
                     input(f"Enter filename: ")
                 )
 
-                graphCreator.plot_review_categories(output_file_path)
+                graph_creator().plot_review_categories(output_file_path)
 
             elif input_value == 12:
-                naturalLanguageAPI.display_models()
+                natural_language_api().display_models()
 
             elif input_value == 13:
-                naturalLanguageAPI.remove_model(
+                natural_language_api().remove_model(
                     input(f"Enter model's id: ")
                 )
 
             elif input_value == 14:
-                naturalLanguageAPI.display_current_operations()
+                natural_language_api().display_current_operations()
 
             elif input_value == 15:
                 quit(0)
 
+            elif input_value == 16:
+                with open(input("Enter the name of the file with film URLs: "), "r", encoding="UTF-8") as urls_file:
+                    web_scraper().batch_scrape(
+                        [line.strip() for line in urls_file if line.strip()]
+                    )
+
+            elif input_value == 17:
+                storage_api().create_blobs(
+                    input("Enter the folder's path: "),
+                    input("Enter the prefix of the new blobs' names: ")
+                )
+
+            elif input_value == 18:
+                natural_language_api().create_and_train_local_model(
+                    input(f"Enter model's name: "),
+                    input("Enter the existing file's name: ")
+                )
+
+            elif input_value == 19:
+                output_file_path = natural_language_api().apply_model_prediction(
+                    input(f"Enter model's name: "),
+                    input(f"Enter filename: "),
+                    "local"
+                )
+
+                graph_creator().plot_review_categories(output_file_path)
+
+            elif input_value == 20:
+                graph_creator().plot_all_review_categories(
+                    group_by=input("Group the results by film or day: ")
+                )
+
+            elif input_value == 21:
+                dataset_preparer().prepare(input("Enter the existing file's name: "))
+
             else:
                 print(f"\n{ConsoleColor.RED}Incorrect input value{ConsoleColor.END}\n")
 
@@ -0,0 +1,92 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from BenchmarkFakes import FakeAutoMlClient, FakeStorageClient
+from ClientRegistry import ClientRegistry
+from ConfigVariables import ConfigVariables
+from ListingCache import listing_cache
+
+
+class CountingStorageClient(FakeStorageClient):
+
+    def __init__(self):
+        super().__init__()
+        self.list_calls = 0
+
+    def list_blobs(self, bucket_name: str, prefix: str = None, page_size: int = None, fields: str = None) -> list:
+        self.list_calls += 1
+        return super().list_blobs(bucket_name, prefix, page_size, fields)
+
+
+class CountingAutoMlClient(FakeAutoMlClient):
+
+    def __init__(self):
+        super().__init__()
+        self.list_calls = 0
+        self.datasets = []
+
+    def list_datasets(self, request, timeout: float = None) -> list:
+        self.list_calls += 1
+        return list(self.datasets)
+
+    def create_dataset(self, parent: str, dataset, timeout: float = None):
+        created_dataset = SimpleNamespace(
+            name=f"{parent}/datasets/TCN{len(self.datasets)}",
+            display_name=dataset.display_name,
+            create_time=None
+        )
+        self.datasets.append(created_dataset)
+
+        return SimpleNamespace(result=lambda: created_dataset)
+
+    def dataset_path(self, project: str, location: str, dataset: str) -> str:
+        return f"projects/{project}/locations/{location}/datasets/{dataset}"
+
+    def import_data(self, name: str, input_config, timeout: float = None):
+        return SimpleNamespace(operation=SimpleNamespace(name=f"{name}/operations/import"))
+
+
+@pytest.fixture(autouse=True)
+def empty_listing_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(ConfigVariables, "uploadIndexFile", str(tmp_path / "upload-index.json"))
+    monkeypatch.setattr(ConfigVariables, "operationsFile", str(tmp_path / "operations.json"))
+    listing_cache.entries.clear()
+    yield
+    listing_cache.entries.clear()
+
+
+def test_blob_listing_is_loaded_once_until_a_blob_is_removed():
+    from StorageAPI import StorageAPI
+
+    client = CountingStorageClient()
+    storage_api = StorageAPI(client)
+    storage_api.bucket.blob(f"reviews{ConfigVariables.blobExtension}").upload_from_file(io.BytesIO(b"review,positive\n"))
+
+    assert len(storage_api.list_blobs()) == 1
+    assert len(storage_api.list_blobs()) == 1
+    assert client.list_calls == 1
+
+    storage_api.remove_blob("reviews")
+
+    assert storage_api.list_blobs() == []
+    assert client.list_calls == 2
+
+
+def test_dataset_listing_is_loaded_once_until_a_dataset_is_created(monkeypatch):
+    client = CountingAutoMlClient()
+    monkeypatch.setitem(ClientRegistry.clients, "automl", client)
+
+    from NaturalLanguageAPI import NaturalLanguageAPI
+
+    natural_language_api = NaturalLanguageAPI()
+
+    assert natural_language_api.display_datasets() == []
+    assert natural_language_api.display_datasets() == []
+    assert client.list_calls == 1
+
+    natural_language_api.create_and_fill_dataset("reviews", "reviews")
+
+    assert [dataset["name"] for dataset in natural_language_api.display_datasets()] == ["reviews"]
+    assert client.list_calls == 2
@@ -0,0 +1,45 @@
+import pytest
+
+from BenchmarkFakes import FakeReviewSite
+from ConfigVariables import ConfigVariables
+from PageFetcher import PageFetcher
+from ReviewPageGenerator import ReviewPageGenerator
+
+
+@pytest.fixture
+def page_fetcher(monkeypatch):
+    monkeypatch.setattr(ConfigVariables, "scraperWorkers", 8)
+    monkeypatch.setattr(ConfigVariables, "scraperRequestsPerHost", 2)
+    monkeypatch.setattr(ConfigVariables, "scraperBackoffSeconds", 0)
+
+    page_fetcher = PageFetcher({})
+    yield page_fetcher
+    page_fetcher.close()
+
+
+def page_urls(review_site: FakeReviewSite, page_amount: int) -> list:
+    return [f"{review_site.url}/user-reviews?page={page}" for page in range(page_amount)]
+
+
+def test_pages_are_returned_in_url_order(page_fetcher):
+    review_page_generator = ReviewPageGenerator(12, 5)
+
+    with FakeReviewSite(12, 5, latency_seconds=0.01) as review_site:
+        pages = page_fetcher.fetch_all(page_urls(review_site, 12))
+
+    assert pages == [review_page_generator.generate_page(page) for page in range(12)]
+
+
+def test_unavailable_pages_are_retried(page_fetcher):
+    with FakeReviewSite(3, 5, failures_per_page=2) as review_site:
+        pages = page_fetcher.fetch_all(page_urls(review_site, 3))
+
+    assert len(pages) == 3
+    assert review_site.requests == [3, 3, 3]
+
+
+def test_requests_to_one_host_are_limited(page_fetcher):
+    with FakeReviewSite(16, 5, latency_seconds=0.05) as review_site:
+        page_fetcher.fetch_all(page_urls(review_site, 16))
+
+    assert review_site.max_concurrent_requests == ConfigVariables.scraperRequestsPerHost
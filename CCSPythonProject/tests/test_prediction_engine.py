@@ -0,0 +1,26 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from BenchmarkFakes import FakePredictionClient
+from ConfigVariables import ConfigVariables
+from PredictionEngine import PredictionEngine
+
+
+def test_engines_of_one_project_share_the_request_quota(monkeypatch):
+    monkeypatch.setattr(ConfigVariables, "predictionRequestsPerMinute", 600)
+    monkeypatch.setattr(ConfigVariables, "predictionBurstSize", 1)
+    location = "projects/quota-test/locations/us-central1"
+    engines = [
+        PredictionEngine(FakePredictionClient(), f"{location}/models/TCN{index}")
+        for index in range(2)
+    ]
+
+    assert engines[0].rate_limiter is engines[1].rate_limiter
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda engine: engine.predict_all([f"review {index}" for index in range(3)]), engines))
+
+    # 6 requests at 10 per second with a burst of 1 need at least 0.5 seconds
+    assert time.perf_counter() - start >= 0.5
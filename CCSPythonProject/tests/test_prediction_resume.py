@@ -0,0 +1,103 @@
+import glob
+import os
+import shutil
+
+import pytest
+
+from BenchmarkFakes import FakeAutoMlClient, FakePredictionClient
+from ClientRegistry import ClientRegistry
+from ConfigVariables import ConfigVariables
+
+snippets = [f"review {index}" for index in range(250)]
+
+
+class CrashingPredictionClient(FakePredictionClient):
+
+    def __init__(self, crash_after: int):
+        super().__init__()
+        self.crash_after = crash_after
+
+    def predict(self, name: str, payload):
+        if self.crash_after is not None and self.requests >= self.crash_after:
+            raise RuntimeError("Prediction run has been interrupted")
+
+        return super().predict(name, payload)
+
+
+@pytest.fixture
+def prediction_client(tmp_path, monkeypatch):
+    for folder in ("ReviewsForPrediction", "ReviewsPredictionResult", "ReviewsPredictionResultStore"):
+        (tmp_path / folder).mkdir()
+
+    monkeypatch.setattr(ConfigVariables, "localPredictionCsvFilesLocation", str(tmp_path / "ReviewsForPrediction"))
+    monkeypatch.setattr(ConfigVariables, "localResultCsvFilesLocation", str(tmp_path / "ReviewsPredictionResult"))
+    monkeypatch.setattr(ConfigVariables, "localResultStoreLocation", str(tmp_path / "ReviewsPredictionResultStore"))
+    monkeypatch.setattr(ConfigVariables, "predictionCacheFile", str(tmp_path / "prediction-cache.sqlite3"))
+    monkeypatch.setattr(ConfigVariables, "operationsFile", str(tmp_path / "operations.json"))
+    monkeypatch.setattr(ConfigVariables, "predictionRequestsPerMinute", 10 ** 9)
+    monkeypatch.setattr(ConfigVariables, "predictionWorkers", 1)
+    monkeypatch.setattr(ConfigVariables, "predictionCheckpointInterval", 50)
+    monkeypatch.setattr(ConfigVariables, "resultStoreBatchSize", 50)
+
+    (tmp_path / "ReviewsForPrediction" / "reviews.csv").write_text("\n".join(snippets) + "\n", encoding="UTF-8")
+
+    prediction_client = CrashingPredictionClient(120)
+    monkeypatch.setitem(ClientRegistry.clients, "automl", FakeAutoMlClient())
+    monkeypatch.setitem(ClientRegistry.clients, "prediction", prediction_client)
+
+    return prediction_client
+
+
+def checkpoint_file_path() -> str:
+    return os.path.join(ConfigVariables.localResultCsvFilesLocation, f"model-reviews.csv{ConfigVariables.checkpointExtension}")
+
+
+def test_csv_prediction_resumes_from_the_last_commit(prediction_client):
+    from NaturalLanguageAPI import NaturalLanguageAPI
+
+    with pytest.raises(RuntimeError):
+        NaturalLanguageAPI().apply_model_prediction("model", "reviews", "automl", "csv")
+
+    with open(checkpoint_file_path(), "r", encoding="UTF-8") as checkpoint_file:
+        assert '"committed_rows": 100' in checkpoint_file.read()
+
+    prediction_client.crash_after = None
+    output_file_path = NaturalLanguageAPI().apply_model_prediction("model", "reviews", "automl")
+
+    with open(output_file_path, "r", encoding="UTF-8") as output_file:
+        rows = [line.rstrip("\n").split(",") for line in output_file]
+
+    # Rows written after the last commit are truncated and predicted again, never duplicated
+    assert [row[0] for row in rows] == snippets
+    assert all(row[1] in ConfigVariables.predictionCategories for row in rows)
+    assert not os.path.exists(checkpoint_file_path())
+
+
+def test_parquet_prediction_resumes_from_the_last_committed_part(prediction_client):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    from NaturalLanguageAPI import NaturalLanguageAPI
+
+    with pytest.raises(RuntimeError):
+        NaturalLanguageAPI().apply_model_prediction("model", "reviews", "automl", "parquet")
+
+    run_directory = glob.glob(os.path.join(ConfigVariables.localResultStoreLocation, "model=model", "*", "*"))[0]
+    part_file_paths = sorted(glob.glob(os.path.join(run_directory, "part-*.parquet")))
+
+    assert [os.path.basename(part_file_path) for part_file_path in part_file_paths] == [
+        "part-00000.parquet", "part-00001.parquet"
+    ]
+
+    # A part written after the checkpoint was saved is not committed and must not be read twice
+    shutil.copy(part_file_paths[0], os.path.join(run_directory, "part-00002.parquet"))
+
+    prediction_client.crash_after = None
+    output_directory = NaturalLanguageAPI().apply_model_prediction("model", "reviews", "automl")
+    texts = []
+
+    for part_file_path in sorted(glob.glob(os.path.join(output_directory, "part-*.parquet"))):
+        texts.extend(pq.read_table(part_file_path, columns=["text"]).column("text").to_pylist())
+
+    assert output_directory == run_directory
+    assert texts == snippets
+    assert not os.path.exists(checkpoint_file_path())
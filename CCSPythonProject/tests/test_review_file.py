@@ -0,0 +1,51 @@
+import csv
+
+import pytest
+
+from ReviewFile import ReviewFile
+
+rows = [
+    ["A plain review", "positive"],
+    ["A review \"quoted\" twice, \"\" and with a comma", "negative"],
+    ["A review\nover three\nlines", "controversial"],
+    ["\"\nA review that starts with a quote and a line break", "negative"],
+    ["A review with a quote at the end of a line \"\nand after it", "positive"],
+    ["Ünïcödé review ✓", "positive"],
+] * 50
+
+
+def write_reviews(file_path, encoding: str = "UTF-8", line_terminator: str = "\n"):
+    with open(file_path, "w", encoding=encoding, newline="") as review_file:
+        csv.writer(review_file, lineterminator=line_terminator).writerows(rows)
+
+
+@pytest.mark.parametrize("encoding", ["UTF-8", "utf-8-sig"])
+@pytest.mark.parametrize("line_terminator", ["\n", "\r\n"])
+def test_rows_are_read_like_the_csv_module_reads_them(tmp_path, encoding, line_terminator):
+    file_path = tmp_path / "reviews.csv"
+    write_reviews(file_path, encoding, line_terminator)
+
+    assert list(ReviewFile(str(file_path)).rows()) == rows
+
+
+@pytest.mark.parametrize("encoding", ["UTF-8", "utf-8-sig"])
+@pytest.mark.parametrize("line_terminator", ["\n", "\r\n"])
+@pytest.mark.parametrize("parts", [1, 2, 3, 7, 64, 10000])
+def test_split_parts_read_like_the_whole_file(tmp_path, encoding, line_terminator, parts):
+    file_path = tmp_path / "reviews.csv"
+    write_reviews(file_path, encoding, line_terminator)
+    review_file = ReviewFile(str(file_path))
+    split = review_file.split(parts)
+
+    # Parts cover the file without gaps or overlaps
+    assert split[0][0] == 0 and split[-1][1] == review_file.size
+    assert all(end == start for (_, end), (start, _) in zip(split, split[1:]))
+    assert [row for start, end in split for row in review_file.rows(start, end)] == list(review_file.rows())
+
+
+def test_empty_file_has_no_parts(tmp_path):
+    file_path = tmp_path / "reviews.csv"
+    file_path.write_bytes(b"")
+
+    assert ReviewFile(str(file_path)).split(4) == []
+    assert list(ReviewFile(str(file_path)).rows()) == []
@@ -0,0 +1,49 @@
+import io
+
+import pytest
+
+from BenchmarkFakes import FakeStorageClient
+from ConfigVariables import ConfigVariables
+
+
+@pytest.fixture
+def storage_api(tmp_path, monkeypatch):
+    monkeypatch.setattr(ConfigVariables, "uploadIndexFile", str(tmp_path / "upload-index.json"))
+
+    from StorageAPI import StorageAPI
+
+    return StorageAPI(FakeStorageClient())
+
+
+def test_shards_of_an_earlier_run_are_removed_before_the_upload(storage_api, tmp_path):
+    for blob_name in ("reviews-prepared/reviews-00000-of-00002.csv", "reviews-prepared/reviews-00001-of-00002.csv",
+                      "reviews-other/reviews.csv"):
+        storage_api.bucket.blob(blob_name).upload_from_file(io.BytesIO(b"review,positive\n"))
+
+    shard_directory = tmp_path / "reviews-prepared"
+    shard_directory.mkdir()
+    (shard_directory / "reviews-00000-of-00001.csv").write_text("review,positive\n", encoding="UTF-8")
+
+    storage_api.create_blobs(str(shard_directory), "reviews-prepared/", remove_stale=True)
+
+    assert sorted(storage_api.bucket.blobs) == ["reviews-other/reviews.csv", "reviews-prepared/reviews-00000-of-00001.csv"]
+
+
+def test_large_files_are_uploaded_in_parts_and_composed(tmp_path, monkeypatch):
+    monkeypatch.setattr(ConfigVariables, "uploadIndexFile", str(tmp_path / "upload-index.json"))
+    monkeypatch.setattr(ConfigVariables, "localDatasetCsvFilesLocation", str(tmp_path))
+    monkeypatch.setattr(ConfigVariables, "storageChunkSize", 1024)
+    monkeypatch.setattr(ConfigVariables, "storageCompositeUploadThreshold", 4096)
+    monkeypatch.setattr(ConfigVariables, "storageCompositeMaxParts", 4)
+
+    from StorageAPI import StorageAPI
+
+    storage_api = StorageAPI(FakeStorageClient())
+    # 20 chunks in at most 4 parts, so every part after the first starts in the middle of the file
+    content = b"".join(f"review {index},positive\n".encode("UTF-8") for index in range(1000))[:20 * 1024 - 7]
+    (tmp_path / "reviews.csv").write_bytes(content)
+
+    storage_api.create_blob("reviews", "reviews")
+
+    assert list(storage_api.bucket.blobs) == ["reviews.csv"]
+    assert storage_api.bucket.blobs["reviews.csv"].data == content